@@ -0,0 +1,144 @@
+"""
+Asynchronous Audit Log Writer
+
+Audit events are queued in-process and written in batches by a background
+thread, so request handlers don't pay for an extra INSERT per call.
+"""
+import atexit
+import queue
+import threading
+import time
+import logging
+from datetime import datetime
+
+from sqlalchemy import insert, update, bindparam
+
+from database import db as database
+from database.models import AuditLog, User
+
+logger = logging.getLogger(__name__)
+
+_Q = queue.Queue(maxsize=10_000)
+_BATCH_SIZE = 100
+_MAX_WAIT = 0.5  # seconds
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def audit_enqueue(action, user_id=None, table_name=None, record_id=None,
+                  changes_json=None, ip_address=None, last_login=None):
+    """
+    Queue an audit event for the background writer.
+    
+    If last_login is given, users.last_login for user_id is updated in the
+    same transaction as the audit insert.
+    """
+    event = {
+        'user_id': user_id,
+        'action': action,
+        'table_name': table_name,
+        'record_id': record_id,
+        'changes_json': changes_json,
+        'ip_address': ip_address,
+        'created_at': datetime.utcnow(),
+        'last_login': last_login
+    }
+
+    _ensure_worker()
+
+    try:
+        _Q.put_nowait(event)
+    except queue.Full:
+        # Don't drop audit events under backpressure; write inline instead
+        logger.warning("Audit queue full, writing event synchronously")
+        _write([event])
+
+
+def flush():
+    """Write out everything currently queued (used at shutdown)"""
+    batch = []
+    while True:
+        try:
+            batch.append(_Q.get_nowait())
+        except queue.Empty:
+            break
+
+        if len(batch) >= _BATCH_SIZE:
+            _write(batch)
+            batch = []
+
+    if batch:
+        _write(batch)
+
+
+def _ensure_worker():
+    """Start the writer thread on first use"""
+    global _worker
+
+    if _worker is not None:
+        return
+
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name='audit-writer', daemon=True)
+            _worker.start()
+            atexit.register(flush)
+
+
+def _drain(max_n, max_wait):
+    """Block for one event, then collect up to max_n events or until max_wait elapses"""
+    batch = [_Q.get()]
+    deadline = time.monotonic() + max_wait
+
+    while len(batch) < max_n:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_Q.get(timeout=remaining))
+        except queue.Empty:
+            break
+
+    return batch
+
+
+def _write(batch):
+    """Insert a batch of audit events (and coalesced last_login updates) in one transaction"""
+    # Keep only the latest login time per user
+    logins = {}
+    for event in batch:
+        login_at = event.pop('last_login', None)
+        user_id = event['user_id']
+        if login_at is None or user_id is None:
+            continue
+        if user_id not in logins or login_at > logins[user_id]:
+            logins[user_id] = login_at
+
+    # A private session, not the thread's scoped one: when the queue is full
+    # this runs on the request thread, inside the handler's own session
+    db = database.SessionLocal.session_factory()
+    try:
+        db.execute(insert(AuditLog), batch)
+
+        if logins:
+            users_table = User.__table__
+            db.execute(
+                update(users_table)
+                .where(users_table.c.id == bindparam('_id'))
+                .values(last_login=bindparam('last_login')),
+                [{'_id': uid, 'last_login': ts} for uid, ts in logins.items()]
+            )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to write %d audit event(s)", len(batch))
+    finally:
+        db.close()
+
+
+def _run():
+    """Writer thread loop"""
+    while True:
+        _write(_drain(_BATCH_SIZE, _MAX_WAIT))
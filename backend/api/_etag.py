@@ -0,0 +1,27 @@
+"""
+HTTP conditional response helpers (ETag / If-None-Match)
+"""
+import hashlib
+
+from flask import request, make_response
+
+
+def fingerprint_etag(*parts):
+    """Build a short ETag from cheap change indicators (e.g. MAX(ts), COUNT(*))"""
+    raw = ':'.join(str(p) for p in parts)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds etag, otherwise None"""
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def conditional(response):
+    """Tag a response with a body-derived ETag and answer 304 when it matches"""
+    response.add_etag()
+    return response.make_conditional(request)
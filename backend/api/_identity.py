@@ -0,0 +1,21 @@
+"""
+Request-scoped JWT identity helpers
+"""
+from flask import g
+from flask_jwt_extended import get_jwt_identity, get_jwt
+
+
+def current_user_id():
+    """Return the authenticated user's id as an int, memoized for the request"""
+    user_id = g.get('_jwt_user_id')
+    if user_id is None:
+        user_id = g._jwt_user_id = int(get_jwt_identity())
+    return user_id
+
+
+def current_claims():
+    """Return the decoded JWT claims, memoized for the request"""
+    claims = g.get('_jwt_claims')
+    if claims is None:
+        claims = g._jwt_claims = get_jwt()
+    return claims
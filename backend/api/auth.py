@@ -3,17 +3,68 @@ Authentication API Endpoints
 """
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import (
-    create_access_token, jwt_required, get_jwt_identity, get_jwt
+    create_access_token, create_refresh_token, jwt_required
 )
+from sqlalchemy import select
 from datetime import datetime
+from functools import lru_cache
 import logging
+import time
 
 from database.db import get_db_session
-from database.models import User, AuditLog
+from database.models import User
+from api._audit import audit_enqueue
+from api._identity import current_user_id, current_claims
+from config import get_config
 
 logger = logging.getLogger(__name__)
 auth_bp = Blueprint('auth', __name__)
 
+# user_id -> (expires_at, is_active), consulted on every authenticated request
+_ACTIVE_CACHE_TTL = get_config().ACTIVE_USER_CACHE_TTL
+_active_cache = {}
+
+
+def _token_claims(user):
+    """Claims embedded in access tokens so endpoints don't need to load the user"""
+    return {
+        'role': user.role,
+        'username': user.username
+    }
+
+
+def _user_is_active(user_id):
+    """Whether the user exists and is active, cached for ACTIVE_USER_CACHE_TTL seconds"""
+    entry = _active_cache.get(user_id)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1]
+    
+    with get_db_session() as db:
+        is_active = bool(db.execute(
+            select(User.is_active).where(User.id == user_id)
+        ).scalar())
+    
+    _active_cache[user_id] = (time.monotonic() + _ACTIVE_CACHE_TTL, is_active)
+    return is_active
+
+
+def verify_token_user(jwt_header, jwt_data):
+    """JWTManager token_verification_loader: reject tokens of deleted or deactivated users"""
+    return _user_is_active(int(jwt_data['sub']))
+
+
+def inactive_token_response(jwt_header, jwt_data):
+    """JWTManager token_verification_failed_loader"""
+    return jsonify({'error': 'Account is inactive'}), 401
+
+
+@lru_cache(maxsize=1024)
+def _load_user(user_id):
+    """Load a user's public profile, cached per process"""
+    with get_db_session() as db:
+        user = db.get(User, user_id)
+        return user.to_dict() if user else None
+
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
@@ -41,38 +92,69 @@ def login():
                 logger.warning(f"Login attempt for inactive user: {username}")
                 return jsonify({'error': 'Account is inactive'}), 403
             
-            user.last_login = datetime.utcnow()
+            # Transparently upgrade legacy / outdated password hashes
+            if user.needs_rehash():
+                user.set_password(password)
             
             # CRITICAL: identity must be string
             access_token = create_access_token(
                 identity=str(user.id),
-                additional_claims={
-                    'role': user.role,
-                    'username': user.username
-                }
+                additional_claims=_token_claims(user)
             )
+            refresh_token = create_refresh_token(identity=str(user.id))
+            
+            user_data = user.to_dict()
+            db.commit()
             
-            audit_log = AuditLog(
-                user_id=user.id,
+            # last_login is written by the audit writer, off the request path
+            audit_enqueue(
+                user_id=user_data['id'],
                 action='login',
-                ip_address=request.remote_addr
+                ip_address=request.remote_addr,
+                last_login=datetime.utcnow()
             )
-            db.add(audit_log)
             
             logger.info(f"User logged in: {username}")
             
             return jsonify({
                 'access_token': access_token,
-                'user': user.to_dict()
+                'refresh_token': refresh_token,
+                'user': user_data
             })
             
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Login error")
         return jsonify({'error': 'Login failed'}), 500
 
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """Issue a new access token from a refresh token"""
+    try:
+        user_id = current_user_id()
+        
+        with get_db_session() as db:
+            user = db.get(User, user_id)
+            
+            if not user:
+                return jsonify({'error': 'User not found'}), 404
+            
+            if not user.is_active:
+                return jsonify({'error': 'Account is inactive'}), 403
+            
+            access_token = create_access_token(
+                identity=str(user.id),
+                additional_claims=_token_claims(user)
+            )
+            
+            return jsonify({'access_token': access_token})
+            
+    except Exception as e:
+        logger.exception("Token refresh error")
+        return jsonify({'error': 'Token refresh failed'}), 500
+
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """Register new user (admin only in production)"""
@@ -108,26 +190,27 @@ def register():
             db.add(user)
             db.flush()
             
-            audit_log = AuditLog(
+            user_data = user.to_dict()
+            db.commit()
+            _load_user.cache_clear()
+            
+            audit_enqueue(
                 user_id=None,
                 action='register',
                 table_name='users',
-                record_id=user.id,
+                record_id=user_data['id'],
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
             logger.info(f"New user registered: {username}")
             
             return jsonify({
                 'message': 'User registered successfully',
-                'user': user.to_dict()
+                'user': user_data
             }), 201
             
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Registration error")
         return jsonify({'error': 'Registration failed'}), 500
 
 
@@ -136,20 +219,29 @@ def register():
 def get_current_user():
     """Get current user info"""
     try:
-        user_id = int(get_jwt_identity())  # Convert string to int
+        user_id = current_user_id()
         
-        with get_db_session() as db:
-            user = db.query(User).filter_by(id=user_id).first()
-            
-            if not user:
-                return jsonify({'error': 'User not found'}), 404
-            
-            return jsonify(user.to_dict())
+        # The token already carries the fields the frontend needs; only hit
+        # the database when the full profile is explicitly requested.
+        # Tokens of inactive users are rejected before we get here.
+        if request.args.get('include') != 'full':
+            claims = current_claims()
+            return jsonify({
+                'id': user_id,
+                'username': claims.get('username'),
+                'role': claims.get('role'),
+                'is_active': True
+            })
+        
+        user = _load_user(user_id)
+        
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        return jsonify(user)
             
     except Exception as e:
-        logger.error(f"Get current user error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Get current user error")
         return jsonify({'error': 'Failed to get user info'}), 500
 
 
@@ -158,7 +250,7 @@ def get_current_user():
 def change_password():
     """Change user password"""
     try:
-        user_id = int(get_jwt_identity())  # Convert string to int
+        user_id = current_user_id()
         data = request.json
         
         old_password = data.get('old_password')
@@ -171,7 +263,7 @@ def change_password():
             return jsonify({'error': 'New password must be at least 8 characters'}), 400
         
         with get_db_session() as db:
-            user = db.query(User).filter_by(id=user_id).first()
+            user = db.get(User, user_id)
             
             if not user:
                 return jsonify({'error': 'User not found'}), 404
@@ -180,24 +272,24 @@ def change_password():
                 return jsonify({'error': 'Invalid old password'}), 401
             
             user.set_password(new_password)
+            username = user.username
+            db.commit()
+            _load_user.cache_clear()
             
-            audit_log = AuditLog(
+            audit_enqueue(
                 user_id=user_id,
                 action='change_password',
                 table_name='users',
                 record_id=user_id,
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
-            logger.info(f"Password changed for user: {user.username}")
+            logger.info(f"Password changed for user: {username}")
             
             return jsonify({'message': 'Password changed successfully'})
             
     except Exception as e:
-        logger.error(f"Change password error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Change password error")
         return jsonify({'error': 'Failed to change password'}), 500
 
 
@@ -206,22 +298,19 @@ def change_password():
 def logout():
     """Logout user"""
     try:
-        user_id = int(get_jwt_identity())  # Convert string to int
+        user_id = current_user_id()
+        _load_user.cache_clear()
         
-        with get_db_session() as db:
-            audit_log = AuditLog(
-                user_id=user_id,
-                action='logout',
-                ip_address=request.remote_addr
-            )
-            db.add(audit_log)
+        audit_enqueue(
+            user_id=user_id,
+            action='logout',
+            ip_address=request.remote_addr
+        )
         
         logger.info(f"User logged out: {user_id}")
         
         return jsonify({'message': 'Logged out successfully'})
         
     except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Logout error")
         return jsonify({'error': 'Logout failed'}), 500
\ No newline at end of file
@@ -2,15 +2,110 @@
 Candidates API Endpoints
 """
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select, insert, tuple_, func
+from sqlalchemy.orm import selectinload
+from datetime import datetime
 import logging
 
-from database.db import get_db_session
-from database.models import Candidate, CandidateNote, AuditLog
+from database.db import get_db_session, record_exists
+from database.models import Candidate, CandidateNote, Resume, ResumeScore, Position
+from api._audit import audit_enqueue
+from api._identity import current_user_id, current_claims
+from api._etag import fingerprint_etag, not_modified, conditional
+from utils.helpers import encode_cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
 candidates_bp = Blueprint('candidates', __name__)
 
+# Columns needed by the candidate list views; selecting them directly skips
+# ORM instance hydration for what can be a large table.
+_CANDIDATE_LIST_COLS = (
+    Candidate.id,
+    Candidate.phone,
+    Candidate.full_name,
+    Candidate.email,
+    Candidate.first_seen,
+    Candidate.last_updated,
+    Candidate.total_submissions,
+    Candidate.notes_summary,
+)
+
+
+# Must match the expression of ix_candidates_search_trgm so PostgreSQL can
+# answer the ILIKE from the trigram index instead of scanning the table.
+_SEARCH_DOC = (
+    func.coalesce(Candidate.full_name, '') + ' ' +
+    func.coalesce(Candidate.phone, '') + ' ' +
+    func.coalesce(Candidate.email, '')
+)
+
+
+def _row_to_list_dict(row):
+    """Convert a projected candidate row to the same shape as Candidate.to_dict()"""
+    return {
+        'id': row.id,
+        'phone': row.phone,
+        'full_name': row.full_name,
+        'email': row.email,
+        'first_seen': row.first_seen.isoformat() if row.first_seen else None,
+        'last_updated': row.last_updated.isoformat() if row.last_updated else None,
+        'total_submissions': row.total_submissions,
+        'notes_summary': row.notes_summary
+    }
+
+
+def _apply_pagination(stmt):
+    """Apply optional ?limit=&offset= query params to a select statement"""
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    
+    if limit is not None:
+        stmt = stmt.limit(max(1, min(limit, 200)))
+    if offset:
+        stmt = stmt.offset(max(0, offset))
+    
+    return stmt
+
+
+# Sort value for rows whose timestamp is NULL (the columns have defaults but
+# are nullable): they page last and their cursors stay decodable
+_NULL_SORT_TS = datetime(1970, 1, 1)
+
+
+def _apply_keyset(stmt, ts_col, id_col):
+    """
+    Apply optional ?limit=&cursor= keyset pagination ordered by (ts_col, id_col) desc.
+    
+    Returns the statement and the effective limit (None when unpaginated).
+    Raises ValueError on a malformed cursor.
+    """
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    
+    sort_ts = func.coalesce(ts_col, _NULL_SORT_TS)
+    stmt = stmt.order_by(sort_ts.desc(), id_col.desc())
+    
+    if cursor:
+        cursor_ts, cursor_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(sort_ts, id_col) < tuple_(cursor_ts, cursor_id))
+        if limit is None:
+            limit = 50
+    
+    if limit is not None:
+        limit = max(1, min(limit, 200))
+        stmt = stmt.limit(limit)
+    
+    return stmt, limit
+
+
+def _next_cursor(rows, limit, ts_attr):
+    """Build the cursor for the page after rows, or None if this was the last page"""
+    if limit is None or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, ts_attr) or _NULL_SORT_TS, last.id)
+
 
 @candidates_bp.route('', methods=['GET'])
 @jwt_required()
@@ -18,18 +113,36 @@ def get_candidates():
     """Get all candidates"""
     try:
         with get_db_session() as db:
-            candidates = db.query(Candidate)\
-                .order_by(Candidate.last_updated.desc())\
-                .all()
-            
-            return jsonify({
-                'candidates': [c.to_dict() for c in candidates]
+            # Cheap aggregate fingerprint: skip building the list entirely
+            # when the client's copy is still current.
+            max_updated, total = db.execute(
+                select(func.max(Candidate.last_updated), func.count(Candidate.id))
+            ).one()
+            etag = fingerprint_etag(max_updated, total, request.query_string.decode())
+            
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+            
+            try:
+                stmt, limit = _apply_keyset(
+                    select(*_CANDIDATE_LIST_COLS),
+                    Candidate.last_updated, Candidate.id
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            rows = db.execute(stmt).all()
+            
+            response = jsonify({
+                'candidates': [_row_to_list_dict(row) for row in rows],
+                'next_cursor': _next_cursor(rows, limit, 'last_updated')
             })
+            response.set_etag(etag)
+            return response
             
     except Exception as e:
-        logger.error(f"Get candidates error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Get candidates error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -39,7 +152,13 @@ def get_candidate(candidate_id):
     """Get candidate profile"""
     try:
         with get_db_session() as db:
-            candidate = db.query(Candidate).filter_by(id=candidate_id).first()
+            candidate = db.query(Candidate)\
+                .options(
+                    selectinload(Candidate.resumes),
+                    selectinload(Candidate.notes).selectinload(CandidateNote.author)
+                )\
+                .filter_by(id=candidate_id)\
+                .first()
             
             if not candidate:
                 return jsonify({'error': 'Candidate not found'}), 404
@@ -47,12 +166,10 @@ def get_candidate(candidate_id):
             result = candidate.to_dict(include_resumes=True)
             result['notes'] = [n.to_dict() for n in candidate.notes]
             
-            return jsonify(result)
+            return conditional(jsonify(result))
             
     except Exception as e:
-        logger.error(f"Get candidate error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Get candidate error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -62,27 +179,40 @@ def get_candidate_resumes(candidate_id):
     """Get all resumes for a candidate"""
     try:
         with get_db_session() as db:
-            candidate = db.query(Candidate).filter_by(id=candidate_id).first()
+            candidate_row = db.execute(
+                select(*_CANDIDATE_LIST_COLS).where(Candidate.id == candidate_id)
+            ).first()
             
-            if not candidate:
+            if not candidate_row:
                 return jsonify({'error': 'Candidate not found'}), 404
             
+            candidate = _row_to_list_dict(candidate_row)
+            
+            # Resumes with their score and position in a single joined query
+            rows = db.execute(
+                select(Resume, ResumeScore, Position)
+                .outerjoin(ResumeScore, ResumeScore.resume_id == Resume.id)
+                .outerjoin(Position, Position.id == Resume.position_id)
+                .where(Resume.candidate_id == candidate_id)
+            ).all()
+            
             resumes = []
-            for resume in candidate.resumes:
-                resume_dict = resume.to_dict(include_details=True)
-                if resume.aggregate_score:
-                    resume_dict['score'] = resume.aggregate_score.to_dict()
+            for resume, score, position in rows:
+                resume_dict = resume.to_dict()
+                resume_dict['candidate'] = candidate
+                resume_dict['position'] = position.to_dict() if position else None
+                resume_dict['aggregate_score'] = score.to_dict() if score else None
+                if score:
+                    resume_dict['score'] = resume_dict['aggregate_score']
                 resumes.append(resume_dict)
             
-            return jsonify({
-                'candidate': candidate.to_dict(),
+            return conditional(jsonify({
+                'candidate': candidate,
                 'resumes': resumes
-            })
+            }))
             
     except Exception as e:
-        logger.error(f"Get candidate resumes error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Get candidate resumes error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -92,24 +222,28 @@ def get_candidate_notes(candidate_id):
     """Get all notes for a candidate"""
     try:
         with get_db_session() as db:
-            candidate = db.query(Candidate).filter_by(id=candidate_id).first()
-            
-            if not candidate:
+            if not record_exists(db, Candidate, candidate_id):
                 return jsonify({'error': 'Candidate not found'}), 404
             
-            notes = db.query(CandidateNote)\
-                .filter_by(candidate_id=candidate_id)\
-                .order_by(CandidateNote.created_at.desc())\
-                .all()
+            try:
+                stmt, limit = _apply_keyset(
+                    select(CandidateNote)
+                        .options(selectinload(CandidateNote.author))
+                        .where(CandidateNote.candidate_id == candidate_id),
+                    CandidateNote.created_at, CandidateNote.id
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            notes = db.execute(stmt).scalars().all()
             
             return jsonify({
-                'notes': [n.to_dict() for n in notes]
+                'notes': [n.to_dict() for n in notes],
+                'next_cursor': _next_cursor(notes, limit, 'created_at')
             })
             
     except Exception as e:
-        logger.error(f"Get candidate notes error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Get candidate notes error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -118,7 +252,7 @@ def get_candidate_notes(candidate_id):
 def add_candidate_note(candidate_id):
     """Add note to candidate"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.json
         
         note_text = data.get('note_text')
@@ -127,40 +261,39 @@ def add_candidate_note(candidate_id):
             return jsonify({'error': 'Note text is required'}), 400
         
         with get_db_session() as db:
-            candidate = db.query(Candidate).filter_by(id=candidate_id).first()
-            
-            if not candidate:
+            if not record_exists(db, Candidate, candidate_id):
                 return jsonify({'error': 'Candidate not found'}), 404
             
-            note = CandidateNote(
-                candidate_id=candidate_id,
-                user_id=user_id,
-                note_text=note_text
-            )
-            
-            db.add(note)
-            db.flush()
+            # Single INSERT ... RETURNING; no ORM instance or author lookup needed
+            note_id, created_at = db.execute(
+                insert(CandidateNote)
+                .values(candidate_id=candidate_id, author_id=user_id, note_text=note_text)
+                .returning(CandidateNote.id, CandidateNote.created_at)
+            ).one()
+            db.commit()
             
-            audit_log = AuditLog(
+            audit_enqueue(
                 user_id=user_id,
                 action='add_candidate_note',
                 table_name='candidate_notes',
-                record_id=note.id,
+                record_id=note_id,
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
             logger.info(f"Note added to candidate {candidate_id} by user {user_id}")
             
             return jsonify({
                 'message': 'Note added successfully',
-                'note': note.to_dict()
+                'note': {
+                    'id': note_id,
+                    'note_text': note_text,
+                    'author': current_claims().get('username'),
+                    'created_at': created_at.isoformat() if created_at else None
+                }
             }), 201
             
     except Exception as e:
-        logger.error(f"Add candidate note error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Add candidate note error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -169,7 +302,7 @@ def add_candidate_note(candidate_id):
 def update_candidate_note(candidate_id, note_id):
     """Update candidate note"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.json
         
         note_text = data.get('note_text')
@@ -186,31 +319,31 @@ def update_candidate_note(candidate_id, note_id):
             if not note:
                 return jsonify({'error': 'Note not found'}), 404
             
-            if note.user_id != user_id:
+            if note.author_id != user_id:
                 return jsonify({'error': 'Not authorized to edit this note'}), 403
             
             note.note_text = note_text
             
-            audit_log = AuditLog(
+            note_data = note.to_dict()
+            db.commit()
+            
+            audit_enqueue(
                 user_id=user_id,
                 action='update_candidate_note',
                 table_name='candidate_notes',
                 record_id=note_id,
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
             logger.info(f"Note {note_id} updated by user {user_id}")
             
             return jsonify({
                 'message': 'Note updated successfully',
-                'note': note.to_dict()
+                'note': note_data
             })
             
     except Exception as e:
-        logger.error(f"Update candidate note error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Update candidate note error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -219,7 +352,7 @@ def update_candidate_note(candidate_id, note_id):
 def delete_candidate_note(candidate_id, note_id):
     """Delete candidate note"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         
         with get_db_session() as db:
             note = db.query(CandidateNote).filter_by(
@@ -230,28 +363,26 @@ def delete_candidate_note(candidate_id, note_id):
             if not note:
                 return jsonify({'error': 'Note not found'}), 404
             
-            if note.user_id != user_id:
+            if note.author_id != user_id:
                 return jsonify({'error': 'Not authorized to delete this note'}), 403
             
             db.delete(note)
+            db.commit()
             
-            audit_log = AuditLog(
+            audit_enqueue(
                 user_id=user_id,
                 action='delete_candidate_note',
                 table_name='candidate_notes',
                 record_id=note_id,
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
             logger.info(f"Note {note_id} deleted by user {user_id}")
             
             return jsonify({'message': 'Note deleted successfully'})
             
     except Exception as e:
-        logger.error(f"Delete candidate note error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Delete candidate note error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -266,18 +397,15 @@ def search_candidates():
             return jsonify({'error': 'Search query must be at least 2 characters'}), 400
         
         with get_db_session() as db:
-            candidates = db.query(Candidate).filter(
-                (Candidate.full_name.ilike(f'%{query}%')) |
-                (Candidate.phone.ilike(f'%{query}%')) |
-                (Candidate.email.ilike(f'%{query}%'))
-            ).all()
+            stmt = select(*_CANDIDATE_LIST_COLS)\
+                .where(_SEARCH_DOC.ilike(f'%{query}%'))\
+                .order_by(Candidate.last_updated.desc())
+            rows = db.execute(_apply_pagination(stmt)).all()
             
             return jsonify({
-                'candidates': [c.to_dict() for c in candidates]
+                'candidates': [_row_to_list_dict(row) for row in rows]
             })
             
     except Exception as e:
-        logger.error(f"Search candidates error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Search candidates error")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
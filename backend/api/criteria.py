@@ -2,15 +2,32 @@
 Criteria API Endpoints
 """
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from sqlalchemy import insert, update, bindparam
 import logging
 
-from database.db import get_db_session
-from database.models import Criterion, Position, AuditLog
+from database.db import get_db_session, record_exists
+from database.models import Criterion, Position
+from api._audit import audit_enqueue
+from api._identity import current_user_id
+from api._etag import conditional
+from services.position_cache import invalidate_position_cache
 
 logger = logging.getLogger(__name__)
 criteria_bp = Blueprint('criteria', __name__)
 
+# Updatable criterion fields and whether changes to them are recorded in the audit log
+_CRITERION_FIELDS = (
+    ('criterion_name', True),
+    ('criterion_key', False),
+    ('category', False),
+    ('data_type', False),
+    ('weight', True),
+    ('config_json', False),
+    ('is_required', False),
+    ('display_order', False),
+)
+
 
 @criteria_bp.route('/positions/<int:position_id>/criteria', methods=['GET'])
 @jwt_required()
@@ -18,9 +35,7 @@ def get_criteria(position_id):
     """Get all criteria for a position"""
     try:
         with get_db_session() as db:
-            position = db.query(Position).filter_by(id=position_id).first()
-            
-            if not position:
+            if not record_exists(db, Position, position_id):
                 return jsonify({'error': 'Position not found'}), 404
             
             criteria = db.query(Criterion)\
@@ -28,12 +43,12 @@ def get_criteria(position_id):
                 .order_by(Criterion.display_order)\
                 .all()
             
-            return jsonify({
+            return conditional(jsonify({
                 'criteria': [c.to_dict() for c in criteria]
-            })
+            }))
             
     except Exception as e:
-        logger.error(f"Get criteria error: {str(e)}")
+        logger.exception("Get criteria error")
         return jsonify({'error': 'Failed to get criteria'}), 500
 
 
@@ -42,49 +57,51 @@ def get_criteria(position_id):
 def create_criterion(position_id):
     """Create new criterion for a position"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.json
         
         with get_db_session() as db:
-            position = db.query(Position).filter_by(id=position_id).first()
-            
-            if not position:
+            if not record_exists(db, Position, position_id):
                 return jsonify({'error': 'Position not found'}), 404
             
-            criterion = Criterion(
-                position_id=position_id,
-                criterion_key=data.get('criterion_key'),
-                criterion_name=data.get('criterion_name'),
-                category=data.get('category', 'core'),
-                data_type=data.get('data_type'),
-                weight=data.get('weight'),
-                config_json=data.get('config_json', {}),
-                is_required=data.get('is_required', False),
-                display_order=data.get('display_order', 0)
-            )
-            
-            db.add(criterion)
-            db.flush()
-            
-            audit_log = AuditLog(
+            values = {
+                'position_id': position_id,
+                'criterion_key': data.get('criterion_key'),
+                'criterion_name': data.get('criterion_name'),
+                'category': data.get('category', 'core'),
+                'data_type': data.get('data_type'),
+                'weight': data.get('weight'),
+                'config_json': data.get('config_json', {}),
+                'is_required': data.get('is_required', False),
+                'display_order': data.get('display_order', 0)
+            }
+            
+            # Single INSERT ... RETURNING instead of ORM add + flush
+            criterion_id = db.execute(
+                insert(Criterion).values(**values).returning(Criterion.id)
+            ).scalar_one()
+            
+            db.commit()
+            invalidate_position_cache(position_id)
+            
+            audit_enqueue(
                 user_id=user_id,
                 action='create_criterion',
                 table_name='criteria',
-                record_id=criterion.id,
-                changes_json={'criterion_name': criterion.criterion_name},
+                record_id=criterion_id,
+                changes_json={'criterion_name': values['criterion_name']},
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
-            logger.info(f"Criterion created: {criterion.criterion_name} (ID: {criterion.id})")
+            logger.info(f"Criterion created: {values['criterion_name']} (ID: {criterion_id})")
             
             return jsonify({
                 'message': 'Criterion created successfully',
-                'criterion': criterion.to_dict()
+                'criterion': {'id': criterion_id, **values}
             }), 201
             
     except Exception as e:
-        logger.error(f"Create criterion error: {str(e)}")
+        logger.exception("Create criterion error")
         return jsonify({'error': 'Failed to create criterion'}), 500
 
 
@@ -94,7 +111,7 @@ def get_criterion(criterion_id):
     """Get criterion by ID"""
     try:
         with get_db_session() as db:
-            criterion = db.query(Criterion).filter_by(id=criterion_id).first()
+            criterion = db.get(Criterion, criterion_id)
             
             if not criterion:
                 return jsonify({'error': 'Criterion not found'}), 404
@@ -102,7 +119,7 @@ def get_criterion(criterion_id):
             return jsonify(criterion.to_dict())
             
     except Exception as e:
-        logger.error(f"Get criterion error: {str(e)}")
+        logger.exception("Get criterion error")
         return jsonify({'error': 'Failed to get criterion'}), 500
 
 
@@ -111,44 +128,30 @@ def get_criterion(criterion_id):
 def update_criterion(criterion_id):
     """Update criterion"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.json
         
         with get_db_session() as db:
-            criterion = db.query(Criterion).filter_by(id=criterion_id).first()
+            criterion = db.get(Criterion, criterion_id)
             
             if not criterion:
                 return jsonify({'error': 'Criterion not found'}), 404
             
             changes = {}
             
-            if 'criterion_name' in data:
-                changes['criterion_name'] = {'old': criterion.criterion_name, 'new': data['criterion_name']}
-                criterion.criterion_name = data['criterion_name']
-            
-            if 'criterion_key' in data:
-                criterion.criterion_key = data['criterion_key']
+            for field, tracked in _CRITERION_FIELDS:
+                if field in data:
+                    if tracked:
+                        changes[field] = {'old': getattr(criterion, field), 'new': data[field]}
+                    setattr(criterion, field, data[field])
             
-            if 'category' in data:
-                criterion.category = data['category']
-            
-            if 'data_type' in data:
-                criterion.data_type = data['data_type']
-            
-            if 'weight' in data:
-                changes['weight'] = {'old': criterion.weight, 'new': data['weight']}
-                criterion.weight = data['weight']
-            
-            if 'config_json' in data:
-                criterion.config_json = data['config_json']
-            
-            if 'is_required' in data:
-                criterion.is_required = data['is_required']
+            logger.info(f"Criterion updated: {criterion.criterion_name} (ID: {criterion_id})")
             
-            if 'display_order' in data:
-                criterion.display_order = data['display_order']
+            result = criterion.to_dict()
+            db.commit()
+            invalidate_position_cache(result['position_id'])
             
-            audit_log = AuditLog(
+            audit_enqueue(
                 user_id=user_id,
                 action='update_criterion',
                 table_name='criteria',
@@ -156,17 +159,14 @@ def update_criterion(criterion_id):
                 changes_json=changes,
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
-            
-            logger.info(f"Criterion updated: {criterion.criterion_name} (ID: {criterion_id})")
             
             return jsonify({
                 'message': 'Criterion updated successfully',
-                'criterion': criterion.to_dict()
+                'criterion': result
             })
             
     except Exception as e:
-        logger.error(f"Update criterion error: {str(e)}")
+        logger.exception("Update criterion error")
         return jsonify({'error': 'Failed to update criterion'}), 500
 
 
@@ -175,18 +175,22 @@ def update_criterion(criterion_id):
 def delete_criterion(criterion_id):
     """Delete criterion"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         
         with get_db_session() as db:
-            criterion = db.query(Criterion).filter_by(id=criterion_id).first()
+            criterion = db.get(Criterion, criterion_id)
             
             if not criterion:
                 return jsonify({'error': 'Criterion not found'}), 404
             
             name = criterion.criterion_name
+            position_id = criterion.position_id
             db.delete(criterion)
             
-            audit_log = AuditLog(
+            db.commit()
+            invalidate_position_cache(position_id)
+            
+            audit_enqueue(
                 user_id=user_id,
                 action='delete_criterion',
                 table_name='criteria',
@@ -194,14 +198,13 @@ def delete_criterion(criterion_id):
                 changes_json={'criterion_name': name},
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
             logger.info(f"Criterion deleted: {name} (ID: {criterion_id})")
             
             return jsonify({'message': 'Criterion deleted successfully'})
             
     except Exception as e:
-        logger.error(f"Delete criterion error: {str(e)}")
+        logger.exception("Delete criterion error")
         return jsonify({'error': 'Failed to delete criterion'}), 500
 
 
@@ -210,32 +213,45 @@ def delete_criterion(criterion_id):
 def reorder_criteria():
     """Reorder criteria"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.json
         criteria_order = data.get('criteria_order', [])
+        position_id = data.get('position_id')
         
         with get_db_session() as db:
-            for order_data in criteria_order:
-                criterion_id = order_data.get('id')
-                display_order = order_data.get('display_order')
+            mappings = [
+                {'_id': o.get('id'), 'display_order': o.get('display_order')}
+                for o in criteria_order
+            ]
+            
+            if mappings:
+                # One executemany UPDATE instead of a SELECT + UPDATE per item
+                criteria_table = Criterion.__table__
+                stmt = update(criteria_table)\
+                    .where(criteria_table.c.id == bindparam('_id'))\
+                    .values(display_order=bindparam('display_order'))
                 
-                criterion = db.query(Criterion).filter_by(id=criterion_id).first()
-                if criterion:
-                    criterion.display_order = display_order
+                if position_id is not None:
+                    stmt = stmt.where(criteria_table.c.position_id == position_id)
+                
+                db.execute(stmt, mappings)
+            
+            db.commit()
+            # Without a position_id any position's criteria may have moved
+            invalidate_position_cache(position_id)
             
-            audit_log = AuditLog(
+            audit_enqueue(
                 user_id=user_id,
                 action='reorder_criteria',
                 table_name='criteria',
                 changes_json={'count': len(criteria_order)},
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
             
             logger.info(f"Criteria reordered: {len(criteria_order)} items")
             
             return jsonify({'message': 'Criteria reordered successfully'})
             
     except Exception as e:
-        logger.error(f"Reorder criteria error: {str(e)}")
+        logger.exception("Reorder criteria error")
         return jsonify({'error': 'Failed to reorder criteria'}), 500
\ No newline at end of file
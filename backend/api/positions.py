@@ -1,32 +1,73 @@
 """
 Positions API Endpoints
 """
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select, func, case, and_
 from datetime import datetime
 import logging
+import time
 
 from database.db import get_db_session
-from database.models import Position, AuditLog
+from database.models import Position, Resume, ResumeScore
+from api._audit import audit_enqueue
+from api._identity import current_user_id
+from config import get_config
+from services.position_cache import invalidate_position_cache
 
 logger = logging.getLogger(__name__)
 positions_bp = Blueprint('positions', __name__)
 
+# Serialized GET /positions body, tagged with the cache version it was built
+# at. Mutations bump the version; the TTL bounds staleness across worker
+# processes, which don't see each other's invalidations.
+_POSITIONS_CACHE_TTL = get_config().POSITIONS_CACHE_TTL
+_positions_cache = {'version': 0, 'entry': None}
+
+
+def _invalidate_positions_cache():
+    """Drop the cached positions list (call after a committed change)"""
+    _positions_cache['version'] += 1
+
 
 @positions_bp.route('', methods=['GET'])
 @jwt_required()
 def get_positions():
     """Get all positions"""
     try:
+        version = _positions_cache['version']
+        entry = _positions_cache['entry']
+        if entry and entry[0] == version and time.monotonic() < entry[1]:
+            return current_app.response_class(entry[2], mimetype='application/json')
+        
         with get_db_session() as db:
-            positions = db.query(Position).all()
-            return jsonify({
-                'positions': [p.to_dict() for p in positions]
+            rows = db.execute(select(
+                Position.id, Position.title, Position.description,
+                Position.threshold_percentage, Position.is_active,
+                Position.created_at, Position.updated_at
+            )).all()
+            
+            response = jsonify({
+                'positions': [
+                    {
+                        'id': row.id,
+                        'title': row.title,
+                        'description': row.description,
+                        'threshold_percentage': row.threshold_percentage,
+                        'is_active': row.is_active,
+                        'created_at': row.created_at.isoformat() if row.created_at else None,
+                        'updated_at': row.updated_at.isoformat() if row.updated_at else None
+                    }
+                    for row in rows
+                ]
             })
+            
+            _positions_cache['entry'] = (
+                version, time.monotonic() + _POSITIONS_CACHE_TTL, response.get_data()
+            )
+            return response
     except Exception as e:
-        logger.error(f"Get positions error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Get positions error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -36,14 +77,14 @@ def get_position(position_id):
     """Get position by ID"""
     try:
         with get_db_session() as db:
-            position = db.query(Position).filter_by(id=position_id).first()
+            position = db.get(Position, position_id)
             
             if not position:
                 return jsonify({'error': 'Position not found'}), 404
             
             return jsonify(position.to_dict(include_criteria=True))
     except Exception as e:
-        logger.error(f"Get position error: {str(e)}")
+        logger.exception("Get position error")
         return jsonify({'error': 'Failed to get position'}), 500
 
 
@@ -52,7 +93,7 @@ def get_position(position_id):
 def create_position():
     """Create new position"""
     try:
-        user_id = int(get_jwt_identity())  # Convert string to int
+        user_id = current_user_id()
         data = request.json
         
         title = data.get('title')
@@ -74,27 +115,28 @@ def create_position():
             db.add(position)
             db.flush()
             
-            audit_log = AuditLog(
+            logger.info(f"Position created: {title} (ID: {position.id})")
+            
+            position_data = position.to_dict()
+            db.commit()
+            _invalidate_positions_cache()
+            
+            audit_enqueue(
                 user_id=user_id,
                 action='create_position',
                 table_name='positions',
-                record_id=position.id,
+                record_id=position_data['id'],
                 changes_json={'title': title},
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
-            
-            logger.info(f"Position created: {title} (ID: {position.id})")
             
             return jsonify({
                 'message': 'Position created successfully',
-                'position': position.to_dict()
+                'position': position_data
             }), 201
             
     except Exception as e:
-        logger.error(f"Create position error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Create position error")
         return jsonify({'error': str(e)}), 500
 
 
@@ -103,11 +145,11 @@ def create_position():
 def update_position(position_id):
     """Update position"""
     try:
-        user_id = int(get_jwt_identity())  # Convert string to int
+        user_id = current_user_id()
         data = request.json
         
         with get_db_session() as db:
-            position = db.query(Position).filter_by(id=position_id).first()
+            position = db.get(Position, position_id)
             
             if not position:
                 return jsonify({'error': 'Position not found'}), 404
@@ -131,25 +173,29 @@ def update_position(position_id):
             
             position.updated_at = datetime.utcnow()
             
-            audit_log = AuditLog(
+            logger.info(f"Position updated: {position.title} (ID: {position_id})")
+            
+            position_data = position.to_dict()
+            db.commit()
+            _invalidate_positions_cache()
+            invalidate_position_cache(position_id)
+            
+            audit_enqueue(
                 user_id=user_id,
                 action='update_position',
                 table_name='positions',
-                record_id=position_id,
+                record_id=position_data['id'],
                 changes_json=changes,
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
-            
-            logger.info(f"Position updated: {position.title} (ID: {position_id})")
             
             return jsonify({
                 'message': 'Position updated successfully',
-                'position': position.to_dict()
+                'position': position_data
             })
             
     except Exception as e:
-        logger.error(f"Update position error: {str(e)}")
+        logger.exception("Update position error")
         return jsonify({'error': 'Failed to update position'}), 500
 
 
@@ -158,10 +204,10 @@ def update_position(position_id):
 def delete_position(position_id):
     """Delete position"""
     try:
-        user_id = int(get_jwt_identity())  # Convert string to int
+        user_id = current_user_id()
         
         with get_db_session() as db:
-            position = db.query(Position).filter_by(id=position_id).first()
+            position = db.get(Position, position_id)
             
             if not position:
                 return jsonify({'error': 'Position not found'}), 404
@@ -169,7 +215,13 @@ def delete_position(position_id):
             title = position.title
             db.delete(position)
             
-            audit_log = AuditLog(
+            logger.info(f"Position deleted: {title} (ID: {position_id})")
+            
+            db.commit()
+            _invalidate_positions_cache()
+            invalidate_position_cache(position_id)
+            
+            audit_enqueue(
                 user_id=user_id,
                 action='delete_position',
                 table_name='positions',
@@ -177,14 +229,11 @@ def delete_position(position_id):
                 changes_json={'title': title},
                 ip_address=request.remote_addr
             )
-            db.add(audit_log)
-            
-            logger.info(f"Position deleted: {title} (ID: {position_id})")
             
             return jsonify({'message': 'Position deleted successfully'})
             
     except Exception as e:
-        logger.error(f"Delete position error: {str(e)}")
+        logger.exception("Delete position error")
         return jsonify({'error': 'Failed to delete position'}), 500
 
 
@@ -193,33 +242,34 @@ def delete_position(position_id):
 def get_position_stats(position_id):
     """Get position statistics"""
     try:
-        from database.models import Resume, ResumeScore
-        
         with get_db_session() as db:
-            position = db.query(Position).filter_by(id=position_id).first()
+            position = db.get(Position, position_id)
             
             if not position:
                 return jsonify({'error': 'Position not found'}), 404
             
-            resumes = db.query(Resume).filter_by(position_id=position_id).all()
-            
-            total_resumes = len(resumes)
-            qualified = 0
-            rejected = 0
-            pending = 0
-            total_score = 0
+            scored = and_(
+                Resume.processing_status == 'completed',
+                ResumeScore.id.isnot(None)
+            )
             
-            for resume in resumes:
-                if resume.processing_status == 'completed' and resume.aggregate_score:
-                    total_score += resume.aggregate_score.percentage
-                    if resume.aggregate_score.status == 'Qualified':
-                        qualified += 1
-                    else:
-                        rejected += 1
-                else:
-                    pending += 1
+            total_resumes, scored_count, qualified, avg_score = db.execute(
+                select(
+                    func.count(Resume.id),
+                    func.sum(case((scored, 1), else_=0)),
+                    func.sum(case((and_(scored, ResumeScore.status == 'Qualified'), 1), else_=0)),
+                    func.avg(case((scored, ResumeScore.percentage)))
+                )
+                .select_from(Resume)
+                .outerjoin(ResumeScore, ResumeScore.resume_id == Resume.id)
+                .where(Resume.position_id == position_id)
+            ).one()
             
-            avg_score = (total_score / (qualified + rejected)) if (qualified + rejected) > 0 else 0
+            scored_count = scored_count or 0
+            qualified = qualified or 0
+            rejected = scored_count - qualified
+            pending = total_resumes - scored_count
+            avg_score = float(avg_score or 0)
             
             return jsonify({
                 'position': position.to_dict(),
@@ -233,5 +283,5 @@ def get_position_stats(position_id):
             })
             
     except Exception as e:
-        logger.error(f"Get position stats error: {str(e)}")
+        logger.exception("Get position stats error")
         return jsonify({'error': 'Failed to get position stats'}), 500
\ No newline at end of file
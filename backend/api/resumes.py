@@ -3,83 +3,233 @@ Resumes API Endpoints - FIXED FOR LLM-BASED SCORING
 ✅ Fixed: Uses LLM for scoring instead of rule-based calculation
 ✅ Fixed: f-string syntax error
 """
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
 from werkzeug.utils import secure_filename
-from datetime import datetime
+from sqlalchemy import select, insert, update, or_, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, joinedload
+from datetime import datetime, timedelta
 import os
 import logging
 import threading
-import traceback
-import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import random
 import hashlib
+from urllib.parse import unquote
+
+from database.db import init_database, get_db_session, lazy_load_guard, record_exists
+from database.models import Resume, Position, Candidate, ResumeData, Score, ResumeScore
+from services.extraction_service import extraction_service
+from services.scoring_service import scoring_engine
+from api._audit import audit_enqueue
+from api._identity import current_user_id
+from api._etag import fingerprint_etag, not_modified
+from config import get_config
+from utils.logging_config import setup_logging
+from utils.json_provider import json_bytes
 
 logger = logging.getLogger(__name__)
 resumes_bp = Blueprint('resumes', __name__)
 
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'uploads')
-ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx'}
+ALLOWED_EXTENSIONS = frozenset({'.pdf', '.doc', '.docx'})
+_ALLOWED_SUFFIXES = tuple(ALLOWED_EXTENSIONS)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+LIST_BATCH_SIZE = 200
+BULK_SAVE_WORKERS = 4
+
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+# Temp phones only need to be unlikely to collide, not unpredictable, so a
+# userspace RNG seeded once replaces a getrandom() syscall per candidate
+_temp_phone_rng = random.Random(os.urandom(16))
+
+
+def _init_process_worker():
+    """Give a worker process its own log listener and engine (inherited ones are not fork-safe)"""
+    setup_logging()
+    init_database(get_config(), create_schema=False)
+
+
+def make_resume_executor(config):
+    """
+    Bounded pool for background resume processing.
+    
+    Threads by default: the work is dominated by the LLM HTTP round-trip and
+    threads share the already-initialized engine. RESUME_WORKER_MODE=process
+    moves extraction/scoring CPU work off the web process's GIL instead.
+    """
+    if config.RESUME_WORKER_MODE == 'process':
+        return ProcessPoolExecutor(
+            max_workers=config.RESUME_WORKERS,
+            initializer=_init_process_worker
+        )
+    return ThreadPoolExecutor(
+        max_workers=config.RESUME_WORKERS,
+        thread_name_prefix='resume-worker'
+    )
+
+
+# With RESUME_DISPATCH=worker the web process only records pending resumes
+# and worker.py processes them, so no pool is started here
+_dispatch_config = get_config()
+_executor = make_resume_executor(_dispatch_config) if _dispatch_config.RESUME_DISPATCH == 'inline' else None
+
+
+def _claimable():
+    """
+    Filter for resumes a worker may claim.
+    
+    That is every 'pending' resume, plus 'processing' ones whose claim is
+    older than RESUME_CLAIM_TIMEOUT (or predates claimed_at): the process
+    that claimed them died mid-run, and nothing else would pick them up.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=_dispatch_config.RESUME_CLAIM_TIMEOUT)
+    return or_(
+        Resume.processing_status == 'pending',
+        and_(
+            Resume.processing_status == 'processing',
+            or_(Resume.claimed_at.is_(None), Resume.claimed_at < stale_before)
+        )
+    )
+
+
+def _queue_resume(resume_id, position_id):
+    """Hand a pending resume to the in-process pool (no-op when worker.py does it)"""
+    if _executor is not None:
+        _executor.submit(process_resume_async, resume_id, position_id)
+
+
+def _discard_file(path):
+    """Delete a stored upload; a file that is already gone is not an error"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not delete {path}: {str(e)}")
+
+
+def _temp_phone():
+    """Placeholder phone for a candidate whose real number isn't extracted yet"""
+    return f"temp_{_temp_phone_rng.getrandbits(56):014x}"
 
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+
+def save_upload(stream, filepath):
+    """
+    Copy an upload stream to disk in chunks.
+    
+    Returns (size in bytes, SHA-256 hex digest); the digest is computed on
+    the chunks as they are written, so the file is never read back.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'wb', buffering=UPLOAD_CHUNK_SIZE) as fh:
+        while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            fh.write(chunk)
+        return fh.tell(), digest.hexdigest()
+
+
+def _find_prior_extraction(db, resume_id, position_id, content_hash):
+    """Extracted data of an earlier upload of the same file for the same position, if any"""
+    if not content_hash:
+        return None
+    return db.execute(
+        select(ResumeData.extracted_json)
+        .join(Resume, ResumeData.resume_id == Resume.id)
+        .where(
+            Resume.content_hash == content_hash,
+            Resume.position_id == position_id,
+            Resume.id != resume_id
+        )
+        .order_by(ResumeData.extracted_at.desc())
+        .limit(1)
+    ).scalar()
 
 
 def process_resume_async(resume_id, position_id):
     """
     ✅ FIXED: Process resume with LLM-based scoring
     """
-    from database.db import get_db_session
-    from database.models import Resume, Candidate, ResumeData, Score, ResumeScore, Position, Criterion
-    from services.extraction_service import ExtractionService
-    from services.scoring_service import ScoringEngine
-    from config import get_config
-    
-    config = get_config()
     thread_name = threading.current_thread().name
     
-    logger.info(f"[{thread_name}] 🚀 Starting AI processing for resume {resume_id}, position {position_id}")
+    logger.info("[%s] 🚀 Starting AI processing for resume %s, position %s", thread_name, resume_id, position_id)
     
     try:
-        # Initialize services
-        extraction_service = ExtractionService()
-        scoring_service = ScoringEngine()
-        
-        # ✅ Step 1: Update to processing
+        # ✅ Step 1: Claim the job and read what extraction needs. Only a
+        # pending (or abandoned) resume can be claimed, so a duplicate
+        # submission (e.g. startup recovery racing an upload) is skipped
+        # instead of rerun.
         with get_db_session() as db:
-            resume = db.query(Resume).filter_by(id=resume_id).first()
-            if not resume:
-                logger.error(f"[{thread_name}] Resume {resume_id} not found")
+            claimed = db.execute(
+                update(Resume)
+                .where(Resume.id == resume_id, _claimable())
+                .values(processing_status='processing', claimed_at=datetime.utcnow())
+            ).rowcount
+            if not claimed:
+                logger.info("[%s] Resume %s missing or already claimed, skipping", thread_name, resume_id)
                 return
             
-            resume.processing_status = 'processing'
-            db.commit()
-            logger.info(f"[{thread_name}] ✅ Status: processing")
-        
-        # ✅ Step 2: Get file path
-        with get_db_session() as db:
-            resume = db.query(Resume).filter_by(id=resume_id).first()
-            candidate_id = resume.candidate_id
-            file_path = resume.file_path
+            candidate_id, file_path, content_hash = db.execute(
+                select(Resume.candidate_id, Resume.file_path, Resume.content_hash)
+                .where(Resume.id == resume_id)
+            ).one()
+            extracted_data = _find_prior_extraction(db, resume_id, position_id, content_hash)
+            logger.info("[%s] ✅ Status: processing", thread_name)
         
         try:
-            # ✅ Step 3: Extract data
-            logger.info(f"[{thread_name}] 📄 Extracting data from: {file_path}")
-            
-            extracted_data = extraction_service.extract_from_file(
-                file_path=file_path,
-                position_id=position_id
-            )
+            # ✅ Step 2: Extract data (no session held during the AI call),
+            # unless this exact file was already extracted for the position
+            if extracted_data:
+                logger.info("[%s] ♻️ Reusing extraction of an identical upload", thread_name)
+            else:
+                logger.info("[%s] 📄 Extracting data from: %s", thread_name, file_path)
+                
+                extracted_data = extraction_service.extract_from_file(
+                    file_path=file_path,
+                    position_id=position_id
+                )
             
             if not extracted_data:
                 raise ValueError("No data extracted from resume")
             
-            logger.info(f"[{thread_name}] ✅ Data extracted: {extracted_data.get('full_name', 'Unknown')}")
+            logger.info("[%s] ✅ Data extracted: %s", thread_name, extracted_data.get('full_name', 'Unknown'))
             
-            # ✅ Step 4: Update candidate
+            # ✅ Steps 3-6: Score, update candidate, save data and results in
+            # one transaction. Scoring runs first so its LLM call happens
+            # before any write is flushed.
             with get_db_session() as db:
-                candidate = db.query(Candidate).filter_by(id=candidate_id).first()
+                logger.info("[%s] 🤖 Starting LLM-based scoring...", thread_name)
+                
+                scoring_result = scoring_engine.score_resume(
+                    db=db,
+                    resume_id=resume_id,
+                    extracted_data=extracted_data,
+                    position_id=position_id
+                )
+                
+                aggregate_result = scoring_result.get('aggregate')
+                if not aggregate_result:
+                    raise ValueError("Failed to calculate aggregate score")
+                
+                logger.info("[%s] 🧮 Scoring completed", thread_name)
+                now = datetime.utcnow()
+                
+                # Resume and candidate in one round trip
+                resume = db.execute(
+                    select(Resume)
+                    .options(joinedload(Resume.candidate))
+                    .where(Resume.id == resume_id)
+                ).scalar_one()
+                
+                # Update candidate
+                candidate = resume.candidate
                 if not candidate:
                     raise ValueError(f"Candidate {candidate_id} not found")
                 
@@ -90,89 +240,61 @@ def process_resume_async(resume_id, position_id):
                 
                 extracted_phone = extracted_data.get('phone')
                 if extracted_phone and extracted_phone != candidate.phone:
-                    existing = db.query(Candidate).filter_by(phone=extracted_phone).first()
-                    if existing and existing.id != candidate_id:
-                        logger.warning(f"[{thread_name}] Phone {extracted_phone} exists for candidate {existing.id}")
+                    existing_id = db.execute(
+                        select(Candidate.id).where(Candidate.phone == extracted_phone)
+                    ).scalar()
+                    if existing_id and existing_id != candidate_id:
+                        logger.warning("[%s] Phone %s exists for candidate %s", thread_name, extracted_phone, existing_id)
                     else:
                         candidate.phone = extracted_phone
                 
-                candidate.last_updated = datetime.utcnow()
-                db.commit()
+                candidate.last_updated = now
+                db.flush()
                 
-                logger.info(f"[{thread_name}] ✅ Candidate updated: {candidate.full_name}")
-            
-            # ✅ Step 5: Save extracted data
-            with get_db_session() as db:
-                resume = db.query(Resume).filter_by(id=resume_id).first()
+                logger.info("[%s] ✅ Candidate updated: %s", thread_name, candidate.full_name)
                 
+                # Save extracted data
                 existing_data = db.query(ResumeData).filter_by(resume_id=resume_id).first()
                 if existing_data:
                     existing_data.extracted_json = extracted_data
-                    existing_data.extracted_at = datetime.utcnow()
+                    existing_data.extracted_at = now
                 else:
-                    resume_data = ResumeData(
+                    db.add(ResumeData(
                         resume_id=resume_id,
                         extracted_json=extracted_data
-                    )
-                    db.add(resume_data)
-                db.commit()
+                    ))
+                db.flush()
                 
-                logger.info(f"[{thread_name}] ✅ Extracted data saved")
-            
-            # ✅ Step 6: Score using LLM (NEW WAY)
-            logger.info(f"[{thread_name}] 🤖 Starting LLM-based scoring...")
-            
-            with get_db_session() as db:
-                # Call scoring service which uses LLM
-                scoring_result = scoring_service.score_resume(
-                    db=db,
-                    resume_id=resume_id,
-                    extracted_data=extracted_data,
-                    position_id=position_id
-                )
+                logger.info("[%s] ✅ Extracted data saved", thread_name)
+                logger.info("[%s] 📊 Score: %.2f%% - %s", thread_name, aggregate_result['percentage'], aggregate_result['status'])
                 
-                logger.info(f"[{thread_name}] 🧮 Scoring completed")
+                # Save AI analysis and mark completed
+                resume.ai_analysis_json = {
+                    'extracted_data': extracted_data,
+                    'aggregate_score': {
+                        'percentage': aggregate_result['percentage'],
+                        'status': aggregate_result['status'],
+                        'total_score': aggregate_result['total_score'],
+                        'max_possible_score': aggregate_result['max_possible_score'],
+                        'overall_assessment': aggregate_result['overall_assessment']
+                    },
+                    'timestamp': now.isoformat()
+                }
+                resume.processing_status = 'completed'
+                resume.candidate_name = candidate.full_name
+                resume.score_percentage = aggregate_result['percentage']
+                resume.score_status = aggregate_result['status']
                 
-                # Fetch results
-                resume = db.query(Resume).filter_by(id=resume_id).first()
-                resume_score = db.query(ResumeScore).filter_by(resume_id=resume_id).first()
+                db.commit()
                 
-                if resume_score:
-                    aggregate_result = {
-                        'percentage': resume_score.percentage,
-                        'status': resume_score.status,
-                        'total_score': resume_score.total_score,
-                        'max_possible_score': resume_score.max_possible_score,
-                        'overall_assessment': resume_score.overall_assessment
-                    }
-                    
-                    logger.info(f"[{thread_name}] 📊 Score: {aggregate_result['percentage']:.2f}% - {aggregate_result['status']}")
-                    
-                    # ✅ Step 7: Save AI analysis
-                    resume.ai_analysis_json = {
-                        'extracted_data': extracted_data,
-                        'aggregate_score': aggregate_result,
-                        'timestamp': datetime.utcnow().isoformat()
-                    }
-                    
-                    # ✅ Step 8: CRITICAL - Update status to completed
-                    resume.processing_status = 'completed'
-                    
-                    db.commit()
-                    
-                    # Verify it was saved
-                    db.refresh(resume)
-                    logger.info(f"[{thread_name}] ✅✅✅ COMPLETED - Status: {resume.processing_status}, Score: {aggregate_result['percentage']:.2f}%")
-                else:
-                    raise ValueError("Failed to calculate aggregate score")
+                logger.info("[%s] ✅✅✅ COMPLETED - Score: %.2f%%", thread_name, aggregate_result['percentage'])
                 
         except Exception as process_error:
-            logger.error(f"[{thread_name}] ❌ Processing error: {str(process_error)}")
-            logger.error(traceback.format_exc())
+            logger.exception("[%s] ❌ Processing error", thread_name)
             
             # Mark as failed
             with get_db_session() as db:
-                resume = db.query(Resume).filter_by(id=resume_id).first()
+                resume = db.get(Resume, resume_id)
                 if resume:
                     resume.processing_status = 'failed'
                     resume.ai_analysis_json = {
@@ -181,15 +303,14 @@ def process_resume_async(resume_id, position_id):
                         'timestamp': datetime.utcnow().isoformat()
                     }
                     db.commit()
-                    logger.info(f"[{thread_name}] Status set to: failed")
+                    logger.info("[%s] Status set to: failed", thread_name)
                     
     except Exception as fatal_error:
-        logger.error(f"[{thread_name}] ❌❌❌ FATAL ERROR: {str(fatal_error)}")
-        logger.error(traceback.format_exc())
+        logger.exception("[%s] ❌❌❌ FATAL ERROR", thread_name)
         
         try:
             with get_db_session() as db:
-                resume = db.query(Resume).filter_by(id=resume_id).first()
+                resume = db.get(Resume, resume_id)
                 if resume:
                     resume.processing_status = 'failed'
                     resume.ai_analysis_json = {
@@ -198,13 +319,232 @@ def process_resume_async(resume_id, position_id):
                         'timestamp': datetime.utcnow().isoformat()
                     }
                     db.commit()
-        except Exception as final_error:
-            logger.error(f"[{thread_name}] Could not update status: {str(final_error)}")
+        except Exception:
+            logger.exception("[%s] Could not update status", thread_name)
 
 
-# Import at module level
-from database.db import get_db_session
-from database.models import Resume, Position, Candidate, ResumeData, Score, ResumeScore, AuditLog
+def pending_resumes(limit=None):
+    """(id, position_id) of resumes no live worker holds a claim on, oldest first"""
+    stmt = (
+        select(Resume.id, Resume.position_id)
+        .where(_claimable())
+        .order_by(Resume.uploaded_at)
+    )
+    if limit:
+        stmt = stmt.limit(limit)
+    
+    with get_db_session() as db:
+        return db.execute(stmt).all()
+
+
+def requeue_pending_resumes():
+    """
+    Resubmit unfinished resumes after a restart.
+    
+    The resume's processing_status is the durable job record: anything not
+    yet claimed when the process stopped is queued again, and so is anything
+    whose claim has timed out because its worker died mid-run.
+    """
+    if _executor is None:
+        return 0
+    
+    pending = pending_resumes()
+    for resume_id, position_id in pending:
+        _queue_resume(resume_id, position_id)
+    
+    if pending:
+        logger.info(f"🔁 Requeued {len(pending)} pending resume(s)")
+    return len(pending)
+
+
+# Columns for list_resumes, labelled <prefix>_<field> per related table
+_RESUME_LIST_COLS = (
+    Resume.id, Resume.filename, Resume.processing_status, Resume.uploaded_at,
+    *(getattr(Candidate, f).label(f'c_{f}') for f in (
+        'id', 'phone', 'full_name', 'email', 'first_seen', 'last_updated',
+        'total_submissions', 'notes_summary'
+    )),
+    *(getattr(Position, f).label(f'p_{f}') for f in (
+        'id', 'title', 'description', 'threshold_percentage', 'is_active',
+        'created_at', 'updated_at'
+    )),
+    *(getattr(ResumeScore, f).label(f's_{f}') for f in (
+        'resume_id', 'total_score', 'max_possible_score', 'percentage', 'status',
+        'overall_assessment', 'calculated_at'
+    )),
+)
+
+
+# Columns for list_resumes?view=summary: denormalized on Resume, plus the
+# position title from its (small) table
+_RESUME_SUMMARY_COLS = (
+    Resume.id, Resume.filename, Resume.processing_status, Resume.uploaded_at,
+    Resume.candidate_name, Resume.score_percentage, Resume.score_status,
+    Position.id.label('p_id'), Position.title.label('p_title'),
+)
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _resume_list_item(row):
+    """Build a list_resumes entry from a projected row (same shape as the model to_dict()s)"""
+    return {
+        'id': row['id'],
+        'filename': row['filename'],
+        'processing_status': row['processing_status'],
+        'uploaded_at': _iso(row['uploaded_at']),
+        'candidate': {
+            'id': row['c_id'],
+            'phone': row['c_phone'],
+            'full_name': row['c_full_name'],
+            'email': row['c_email'],
+            'first_seen': _iso(row['c_first_seen']),
+            'last_updated': _iso(row['c_last_updated']),
+            'total_submissions': row['c_total_submissions'],
+            'notes_summary': row['c_notes_summary']
+        },
+        'position': {
+            'id': row['p_id'],
+            'title': row['p_title'],
+            'description': row['p_description'],
+            'threshold_percentage': row['p_threshold_percentage'],
+            'is_active': row['p_is_active'],
+            'created_at': _iso(row['p_created_at']),
+            'updated_at': _iso(row['p_updated_at'])
+        } if row['p_id'] is not None else None,
+        'score': {
+            'resume_id': row['s_resume_id'],
+            'total_score': float(row['s_total_score']),
+            'max_possible_score': float(row['s_max_possible_score']),
+            'percentage': float(row['s_percentage']),
+            'status': row['s_status'],
+            'overall_assessment': row['s_overall_assessment'],
+            'calculated_at': _iso(row['s_calculated_at'])
+        } if row['s_resume_id'] is not None else None
+    }
+
+
+def _resume_summary_item(row):
+    """Build a list_resumes?view=summary entry; same keys as the full list, fewer fields"""
+    return {
+        'id': row['id'],
+        'filename': row['filename'],
+        'processing_status': row['processing_status'],
+        'uploaded_at': _iso(row['uploaded_at']),
+        'candidate': {
+            'full_name': row['candidate_name']
+        } if row['candidate_name'] is not None else None,
+        'position': {
+            'id': row['p_id'],
+            'title': row['p_title']
+        } if row['p_id'] is not None else None,
+        'score': {
+            'percentage': row['score_percentage'],
+            'status': row['score_status']
+        } if row['score_percentage'] is not None else None
+    }
+
+
+def _insert_upload_rows(db, filename, filepath, file_size, content_hash, position_id, user_id, now):
+    """
+    Insert the "Processing..." candidate and the pending resume for a new upload.
+    
+    Returns:
+        (resume_id, candidate_id), or None if the position doesn't exist
+    """
+    if not record_exists(db, Position, position_id):
+        return None
+    
+    # The temp phone is random, so instead of checking for it first we rely
+    # on the unique constraint; the caller retries on the (very unlikely) collision
+    candidate = Candidate(
+        phone=_temp_phone(),
+        full_name="Processing...",
+        email="",
+        first_seen=now,
+        last_updated=now,
+        total_submissions=1
+    )
+    db.add(candidate)
+    db.flush()
+    
+    resume = Resume(
+        candidate_id=candidate.id,
+        position_id=position_id,
+        filename=filename,
+        file_path=filepath,
+        file_type=os.path.splitext(filename)[1],
+        file_size=file_size,
+        content_hash=content_hash,
+        processing_status='pending',
+        uploaded_by=user_id,
+        uploaded_at=now
+    )
+    db.add(resume)
+    db.flush()
+    
+    return resume.id, candidate.id
+
+
+def _register_upload(filename, filepath, file_size, content_hash, position_id, now):
+    """Create the placeholder candidate and resume for a saved file, then queue processing"""
+    user_id = current_user_id()
+    
+    with get_db_session() as db:
+        # No savepoint here: pysqlite doesn't emit BEGIN before SAVEPOINT, so
+        # releasing one would commit. A temp phone collision rolls back and
+        # redoes the whole unit of work instead.
+        for attempt in range(2):
+            try:
+                ids = _insert_upload_rows(
+                    db, filename, filepath, file_size, content_hash,
+                    int(position_id), user_id, now
+                )
+                break
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+                logger.warning("Temp phone collision, retrying with a new one")
+        
+        if ids is None:
+            _discard_file(filepath)
+            return jsonify({'success': False, 'message': 'Position not found'}), 404
+        
+        resume_id, candidate_id = ids
+        
+        logger.info(f"✅ Resume uploaded: ID {resume_id}, Candidate ID {candidate_id}")
+        
+        db.commit()
+        
+        # Audit row goes through the background writer, off this request
+        audit_enqueue(
+            user_id=user_id,
+            action='upload_resume',
+            table_name='resumes',
+            record_id=resume_id,
+            changes_json={'filename': filename, 'position_id': position_id},
+            ip_address=request.remote_addr
+        )
+        _queue_resume(resume_id, int(position_id))
+        logger.info(f"🚀 Resume {resume_id} queued for processing")
+        
+        return jsonify({
+            'success': True,
+            'message': 'Resume uploaded successfully',
+            'resume': {
+                'id': resume_id,
+                'filename': filename,
+                'processing_status': 'pending',
+                'uploaded_at': now.isoformat()
+            },
+            'candidate': {
+                'id': candidate_id,
+                'full_name': 'Processing...'
+            }
+        }), 201
 
 
 @resumes_bp.route('/upload', methods=['POST'])
@@ -226,104 +566,182 @@ def upload_resume():
         if not position_id:
             return jsonify({'success': False, 'message': 'Position ID required'}), 400
         
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        
+        # One clock read for every timestamp this upload records
+        now = datetime.utcnow()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = secure_filename(file.filename)
         filename = f"{timestamp}_{filename}"
         filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
-        
-        file_size = os.path.getsize(filepath)
+        file_size, content_hash = save_upload(file.stream, filepath)
         logger.info(f"📁 File saved: {filename} ({file_size} bytes)")
         
+        return _register_upload(filename, filepath, file_size, content_hash, position_id, now)
+        
+    except Exception as e:
+        logger.exception("Upload resume error")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@resumes_bp.route('/upload-stream', methods=['POST', 'PUT'])
+@jwt_required()
+def upload_resume_stream():
+    """
+    Upload a resume sent as the raw request body.
+    
+    Same as /upload but skips multipart parsing: the file name and position
+    come from the X-Filename and X-Position-Id headers and the body is
+    copied straight to disk. Header values are latin-1 only, so clients
+    send X-Filename percent-encoded (encodeURIComponent).
+    """
+    try:
+        original_name = unquote(request.headers.get('X-Filename', ''))
+        if not original_name:
+            return jsonify({'success': False, 'message': 'X-Filename header required'}), 400
+        
+        if not allowed_file(original_name):
+            return jsonify({'success': False, 'message': 'Invalid file type'}), 400
+        
+        position_id = request.headers.get('X-Position-Id')
+        if not position_id:
+            return jsonify({'success': False, 'message': 'Position ID required'}), 400
+        
+        try:
+            position_id = int(position_id)
+        except ValueError:
+            return jsonify({'success': False, 'message': 'Invalid position ID'}), 400
+        
+        now = datetime.utcnow()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{timestamp}_{secure_filename(original_name)}"
+        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        file_size, content_hash = save_upload(request.stream, filepath)
+        
+        if not file_size:
+            _discard_file(filepath)
+            return jsonify({'success': False, 'message': 'No file provided'}), 400
+        
+        logger.info(f"📁 File streamed: {filename} ({file_size} bytes)")
+        
+        return _register_upload(filename, filepath, file_size, content_hash, position_id, now)
+        
+    except Exception as e:
+        logger.exception("Stream upload resume error")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@resumes_bp.route('/bulk-upload', methods=['POST'])
+@jwt_required()
+def bulk_upload():
+    """Upload several resumes for one position in a single transaction"""
+    try:
+        position_id = request.form.get('position_id', type=int)
+        if not position_id:
+            return jsonify({'success': False, 'message': 'Position ID required'}), 400
+        
+        files = request.files.getlist('files')
+        if not files:
+            return jsonify({'success': False, 'message': 'No files provided'}), 400
+        
         with get_db_session() as db:
-            position = db.query(Position).filter_by(id=position_id).first()
-            if not position:
-                os.remove(filepath)
+            if not record_exists(db, Position, position_id):
                 return jsonify({'success': False, 'message': 'Position not found'}), 404
+        
+        user_id = current_user_id()
+        now = datetime.utcnow()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Validate and name every file first
+        pending, skipped = [], []
+        for idx, file in enumerate(files):
+            if not file.filename or not allowed_file(file.filename):
+                skipped.append(file.filename)
+                continue
+            
+            # The sequence number keeps same-named files in one batch apart
+            filename = f"{timestamp}_{idx:04d}_{secure_filename(file.filename)}"
+            pending.append((file, filename, os.path.join(UPLOAD_FOLDER, filename)))
+        
+        if not pending:
+            return jsonify({'success': False, 'message': 'No valid files', 'skipped': skipped}), 400
+        
+        # Nothing is recorded unless every file is saved and every row inserted,
+        # so on any failure remove what was written rather than orphan it
+        try:
+            # Write the files concurrently (the copies block on disk, not the GIL)
+            with ThreadPoolExecutor(max_workers=min(BULK_SAVE_WORKERS, len(pending))) as pool:
+                saved = list(pool.map(lambda item: save_upload(item[0].stream, item[2]), pending))
+            
+            # Then insert every row in two statements
+            cand_rows, resume_rows = [], []
+            for (file, filename, filepath), (file_size, content_hash) in zip(pending, saved):
+                cand_rows.append({
+                    'phone': _temp_phone(),
+                    'full_name': "Processing...",
+                    'email': "",
+                    'first_seen': now,
+                    'last_updated': now,
+                    'total_submissions': 1
+                })
+                resume_rows.append({
+                    'position_id': position_id,
+                    'filename': filename,
+                    'file_path': filepath,
+                    'file_type': os.path.splitext(filename)[1],
+                    'file_size': file_size,
+                    'content_hash': content_hash,
+                    'processing_status': 'pending',
+                    'uploaded_by': user_id,
+                    'uploaded_at': now
+                })
             
-            # ✅ FIXED: Create hash string first, then use in f-string
-            timestamp_str = datetime.utcnow().isoformat()
-            hash_input = f"{filename}{timestamp_str}"
-            hash_value = hashlib.md5(hash_input.encode()).hexdigest()[:15]
-            temp_phone = f"temp_{hash_value}"
-            
-            # Check for duplicates
-            while db.query(Candidate).filter_by(phone=temp_phone).first():
-                random_bytes = os.urandom(8).hex()
-                hash_input_new = f"{filename}{timestamp_str}{random_bytes}"
-                hash_value_new = hashlib.md5(hash_input_new.encode()).hexdigest()[:15]
-                temp_phone = f"temp_{hash_value_new}"
-            
-            candidate = Candidate(
-                phone=temp_phone,
-                full_name="Processing...",
-                email="",
-                first_seen=datetime.utcnow(),
-                last_updated=datetime.utcnow(),
-                total_submissions=1
-            )
-            db.add(candidate)
-            db.flush()
-            
-            resume = Resume(
-                candidate_id=candidate.id,
-                position_id=int(position_id),
-                filename=filename,
-                file_path=filepath,
-                file_type=os.path.splitext(filename)[1],
-                file_size=file_size,
-                processing_status='pending',
-                uploaded_by=get_jwt_identity(),
-                uploaded_at=datetime.utcnow()
-            )
-            db.add(resume)
-            db.flush()
-            
-            resume_id = resume.id
-            candidate_id = candidate.id
-            
-            logger.info(f"✅ Resume uploaded: ID {resume_id}, Candidate ID {candidate_id}")
-            
-            audit = AuditLog(
-                user_id=get_jwt_identity(),
+            with get_db_session() as db:
+                candidate_ids = db.scalars(
+                    insert(Candidate).returning(Candidate.id, sort_by_parameter_order=True),
+                    cand_rows
+                ).all()
+                for row, candidate_id in zip(resume_rows, candidate_ids):
+                    row['candidate_id'] = candidate_id
+                resume_ids = db.scalars(
+                    insert(Resume).returning(Resume.id, sort_by_parameter_order=True),
+                    resume_rows
+                ).all()
+                db.commit()
+        except Exception:
+            for _file, _filename, filepath in pending:
+                _discard_file(filepath)
+            raise
+        
+        logger.info(f"✅ Bulk upload: {len(resume_ids)} resume(s) for position {position_id}")
+        
+        for row, resume_id in zip(resume_rows, resume_ids):
+            audit_enqueue(
+                user_id=user_id,
                 action='upload_resume',
                 table_name='resumes',
                 record_id=resume_id,
-                changes_json=json.dumps({'filename': filename, 'position_id': position_id}),
+                changes_json={'filename': row['filename'], 'position_id': position_id},
                 ip_address=request.remote_addr
             )
-            db.add(audit)
-            db.commit()
-            
-            thread = threading.Thread(
-                target=process_resume_async,
-                args=(resume_id, int(position_id)),
-                name=f"resume-{resume_id}",
-                daemon=True
-            )
-            thread.start()
-            logger.info(f"🚀 Background thread started for resume {resume_id}")
-            
-            return jsonify({
-                'success': True,
-                'message': 'Resume uploaded successfully',
-                'resume': {
+            _queue_resume(resume_id, position_id)
+        
+        return jsonify({
+            'success': True,
+            'message': f'{len(resume_ids)} resume(s) uploaded successfully',
+            'resumes': [
+                {
                     'id': resume_id,
-                    'filename': filename,
+                    'candidate_id': row['candidate_id'],
+                    'filename': row['filename'],
                     'processing_status': 'pending',
-                    'uploaded_at': datetime.utcnow().isoformat()
-                },
-                'candidate': {
-                    'id': candidate_id,
-                    'full_name': 'Processing...'
+                    'uploaded_at': now.isoformat()
                 }
-            }), 201
-            
+                for row, resume_id in zip(resume_rows, resume_ids)
+            ],
+            'skipped': skipped
+        }), 201
+        
     except Exception as e:
-        logger.error(f"❌ Upload error: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Bulk upload error")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
@@ -333,31 +751,51 @@ def get_resume_status(resume_id):
     """Get resume processing status"""
     try:
         with get_db_session() as db:
-            resume = db.query(Resume).filter_by(id=resume_id).first()
-            if not resume:
+            # The page polls this while processing: status plus scoring time
+            # change whenever the body would, so unchanged polls get a 304
+            # without loading the resume or its analysis JSON.
+            marker = db.execute(
+                select(Resume.processing_status, ResumeScore.calculated_at)
+                .outerjoin(ResumeScore, ResumeScore.resume_id == Resume.id)
+                .where(Resume.id == resume_id)
+            ).first()
+            if not marker:
                 return jsonify({'success': False, 'message': 'Resume not found'}), 404
             
+            etag = fingerprint_etag(resume_id, *marker)
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+            
+            resume, resume_score = db.execute(
+                select(Resume, ResumeScore)
+                .outerjoin(ResumeScore, ResumeScore.resume_id == Resume.id)
+                .where(Resume.id == resume_id)
+            ).one()
+            
             score_data = None
-            if resume.processing_status == 'completed':
-                resume_score = db.query(ResumeScore).filter_by(resume_id=resume_id).first()
-                if resume_score:
-                    score_data = {
-                        'total_score': float(resume_score.total_score),
-                        'max_possible_score': float(resume_score.max_possible_score),
-                        'percentage': float(resume_score.percentage),
-                        'status': resume_score.status,
-                        'overall_assessment': resume_score.overall_assessment
-                    }
+            if resume.processing_status == 'completed' and resume_score:
+                score_data = {
+                    'total_score': float(resume_score.total_score),
+                    'max_possible_score': float(resume_score.max_possible_score),
+                    'percentage': float(resume_score.percentage),
+                    'status': resume_score.status,
+                    'overall_assessment': resume_score.overall_assessment
+                }
             
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'processing_status': resume.processing_status,
                 'score': score_data,
                 'ai_analysis': resume.ai_analysis_json if resume.processing_status == 'completed' else None
             })
+            # Revalidate on every poll; the ETag makes that cheap
+            response.set_etag(etag)
+            response.cache_control.no_cache = True
+            return response
             
     except Exception as e:
-        logger.error(f"❌ Error getting status: {str(e)}")
+        logger.exception("Get resume status error")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
@@ -367,25 +805,44 @@ def get_resume(resume_id):
     """Get full resume details with individual scores"""
     try:
         with get_db_session() as db:
-            resume = db.query(Resume).filter_by(id=resume_id).first()
-            if not resume:
+            # Resume and its one-to-one rows in a single joined SELECT
+            row = db.execute(
+                select(Resume, Candidate, Position, ResumeScore, ResumeData)
+                .outerjoin(Candidate, Candidate.id == Resume.candidate_id)
+                .outerjoin(Position, Position.id == Resume.position_id)
+                .outerjoin(ResumeScore, ResumeScore.resume_id == Resume.id)
+                .outerjoin(ResumeData, ResumeData.resume_id == Resume.id)
+                .where(Resume.id == resume_id)
+                .options(*lazy_load_guard())
+            ).first()
+            if not row:
                 return jsonify({'success': False, 'message': 'Resume not found'}), 404
             
-            candidate = db.query(Candidate).filter_by(id=resume.candidate_id).first()
-            position = db.query(Position).filter_by(id=resume.position_id).first()
-            resume_score = db.query(ResumeScore).filter_by(resume_id=resume_id).first()
+            resume, candidate, position, resume_score, resume_data = row
             
-            individual_scores = db.query(Score).filter_by(resume_id=resume_id).all()
+            # One query for the scores plus one IN query for their criteria
+            individual_scores = db.execute(
+                select(Score)
+                .where(Score.resume_id == resume_id)
+                .options(selectinload(Score.criterion), *lazy_load_guard())
+            ).scalars().all()
             scores_data = []
             for score in individual_scores:
-                score_dict = score.to_dict()
-                if score.criterion:
-                    score_dict['criterion_name'] = score.criterion.criterion_name
-                    score_dict['category'] = score.criterion.category
+                score_dict = {
+                    'id': score.id,
+                    'criterion_id': score.criterion_id,
+                    'extracted_value': score.extracted_value,
+                    'awarded_points': float(score.awarded_points) if score.awarded_points else 0,
+                    'max_points': float(score.max_points) if score.max_points else 0,
+                    'score_multiplier': float(score.score_multiplier) if score.score_multiplier else 0,
+                    'reasoning': score.reasoning
+                }
+                criterion = score.criterion
+                if criterion:
+                    score_dict['criterion_name'] = criterion.criterion_name
+                    score_dict['category'] = criterion.category
                 scores_data.append(score_dict)
             
-            resume_data = db.query(ResumeData).filter_by(resume_id=resume_id).first()
-            
             return jsonify({
                 'success': True,
                 'resume': {
@@ -402,52 +859,70 @@ def get_resume(resume_id):
             })
             
     except Exception as e:
-        logger.error(f"❌ Error getting resume: {str(e)}")
+        logger.exception("Get resume error")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+def _stream_resume_list(stmt, build_item):
+    """Yield the list_resumes JSON body one batch of rows at a time"""
+    yield b'{"success":true,"resumes":['
+    total = 0
+    try:
+        with get_db_session() as db:
+            result = db.execute(stmt.execution_options(yield_per=LIST_BATCH_SIZE))
+            for batch in result.mappings().partitions():
+                chunk = b','.join(json_bytes(build_item(row)) for row in batch)
+                yield (b',' + chunk) if total else chunk
+                total += len(batch)
+    except Exception:
+        # Headers are already sent; log and end the body as valid JSON
+        logger.exception("List resumes stream error")
+    yield b'],"total":%d}' % total
+
+
 @resumes_bp.route('', methods=['GET'])
 @jwt_required()
 def list_resumes():
-    """List all resumes"""
+    """
+    List all resumes (streamed, so memory doesn't grow with the result size).
+    
+    ?view=summary returns only what the dashboard and results table show
+    (name, position title, score percentage/status) from columns kept on
+    the resume row itself.
+    """
     try:
         position_id = request.args.get('position_id', type=int)
         status = request.args.get('status')
         
-        with get_db_session() as db:
-            query = db.query(Resume).order_by(Resume.uploaded_at.desc())
-            
-            if position_id:
-                query = query.filter_by(position_id=position_id)
-            if status:
-                query = query.filter_by(processing_status=status)
-            
-            resumes = query.all()
-            
-            result = []
-            for resume in resumes:
-                candidate = db.query(Candidate).filter_by(id=resume.candidate_id).first()
-                position = db.query(Position).filter_by(id=resume.position_id).first()
-                score = db.query(ResumeScore).filter_by(resume_id=resume.id).first()
-                
-                result.append({
-                    'id': resume.id,
-                    'filename': resume.filename,
-                    'processing_status': resume.processing_status,
-                    'uploaded_at': resume.uploaded_at.isoformat() if resume.uploaded_at else None,
-                    'candidate': candidate.to_dict() if candidate else None,
-                    'position': position.to_dict() if position else None,
-                    'score': score.to_dict() if score else None
-                })
-            
-            return jsonify({
-                'success': True,
-                'resumes': result,
-                'total': len(result)
-            })
-            
+        if request.args.get('view') == 'summary':
+            stmt = select(*_RESUME_SUMMARY_COLS)\
+                .select_from(Resume)\
+                .outerjoin(Position, Position.id == Resume.position_id)\
+                .order_by(Resume.uploaded_at.desc())
+            build_item = _resume_summary_item
+        else:
+            # Plain Core rows: no Resume/Candidate/Position/ResumeScore
+            # instances are built for what is the dashboard's largest query.
+            stmt = select(*_RESUME_LIST_COLS)\
+                .select_from(Resume)\
+                .join(Candidate, Candidate.id == Resume.candidate_id)\
+                .outerjoin(Position, Position.id == Resume.position_id)\
+                .outerjoin(ResumeScore, ResumeScore.resume_id == Resume.id)\
+                .order_by(Resume.uploaded_at.desc())
+            build_item = _resume_list_item
+        
+        if position_id:
+            stmt = stmt.where(Resume.position_id == position_id)
+        if status:
+            stmt = stmt.where(Resume.processing_status == status)
+        
+        return Response(
+            stream_with_context(_stream_resume_list(stmt, build_item)),
+            mimetype='application/json'
+        )
+        
     except Exception as e:
-        logger.error(f"❌ Error listing resumes: {str(e)}")
+        logger.exception("List resumes error")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
@@ -457,28 +932,28 @@ def delete_resume(resume_id):
     """Delete resume"""
     try:
         with get_db_session() as db:
-            resume = db.query(Resume).filter_by(id=resume_id).first()
+            resume = db.get(Resume, resume_id)
             if not resume:
                 return jsonify({'success': False, 'message': 'Resume not found'}), 404
             
-            if os.path.exists(resume.file_path):
-                os.remove(resume.file_path)
+            _discard_file(resume.file_path)
             
+            filename = resume.filename
             db.delete(resume)
             
-            audit = AuditLog(
-                user_id=get_jwt_identity(),
+            db.commit()
+            
+            audit_enqueue(
+                user_id=current_user_id(),
                 action='delete_resume',
                 table_name='resumes',
                 record_id=resume_id,
-                changes_json=json.dumps({'filename': resume.filename}),
+                changes_json={'filename': filename},
                 ip_address=request.remote_addr
             )
-            db.add(audit)
-            db.commit()
             
             return jsonify({'success': True, 'message': 'Resume deleted'})
             
     except Exception as e:
-        logger.error(f"❌ Error deleting resume: {str(e)}")
+        logger.exception("Delete resume error")
         return jsonify({'success': False, 'message': str(e)}), 500
\ No newline at end of file
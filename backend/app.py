@@ -5,19 +5,29 @@ FIXED VERSION: Proper CORS for Liara deployment
 from flask import Flask, send_from_directory, jsonify
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-from datetime import timedelta
+from flask_compress import Compress
+from whitenoise import WhiteNoise
 import os
+import re
 import logging
 from utils.logging_config import setup_logging
+from utils.json_provider import ORJSONProvider, json_bytes
 
 # Import configuration
 from config import get_config
 
+# Absolute frontend paths, resolved once at import instead of per request
+FRONTEND_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+UPLOADS_DIR = os.path.join(FRONTEND_DIR, 'uploads')
+
 # Create Flask app
 app = Flask(__name__, 
-            static_folder='../frontend',
+            static_folder=FRONTEND_DIR,
             static_url_path='')
 
+# Serialize/parse JSON with orjson
+app.json = ORJSONProvider(app)
+
 # Setup logging FIRST
 setup_logging(app)
 logger = logging.getLogger(__name__)
@@ -26,38 +36,64 @@ logger = logging.getLogger(__name__)
 config = get_config()
 app.config.from_object(config)
 
-# JWT Configuration
-app.config['JWT_SECRET_KEY'] = config.JWT_SECRET_KEY
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
-app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
-
 # Initialize extensions
 jwt = JWTManager(app)
+Compress(app)
+
+
+def _static_cache_headers(headers, path, url):
+    """Pages revalidate on every load; only /assets keeps STATIC_MAX_AGE"""
+    if not url.startswith('/assets/'):
+        headers['Cache-Control'] = 'no-cache'
+
+
+# '/', /assets/* and the other frontend files are answered by WhiteNoise
+# before Flask routing: headers, ETags and the .br/.gz siblings written by
+# utils/precompress.py are prepared once at startup. Asset names carry no
+# content hash, so they are cacheable but not immutable.
+app.wsgi_app = WhiteNoise(
+    app.wsgi_app,
+    root=FRONTEND_DIR,
+    index_file=True,
+    max_age=config.STATIC_MAX_AGE,
+    autorefresh=config.DEBUG,
+    add_headers_function=_static_cache_headers
+)
+
+# Local development origins on any port, compiled once instead of matched
+# as a pattern string on every request
+LOCAL_ORIGIN_RE = re.compile(r'^http://(localhost|127\.0\.0\.1)(:\d+)?$')
 
 # ✅ CRITICAL: CORS Configuration for Liara
 CORS(app, resources={
     r"/api/*": {
         "origins": [
             "https://drfiller.liara.run",  # ✅ اضافه شدن دامنه Liara
-            "http://localhost:*",
-            "http://127.0.0.1:*"
+            LOCAL_ORIGIN_RE
         ],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
-        "supports_credentials": True
+        "allow_headers": ["Content-Type", "Authorization", "X-Filename", "X-Position-Id"],
+        "supports_credentials": True,
+        "max_age": 86400  # browsers reuse a preflight for a day
     }
 })
 
 # Import database components
-from database.db import init_database, create_default_admin, seed_database
+from database.db import (
+    init_database, create_default_admin, seed_database, remove_session, dispose_engine_after_fork
+)
 
 # Import API blueprints
-from api.auth import auth_bp
-from api.resumes import resumes_bp
+from api.auth import auth_bp, verify_token_user, inactive_token_response
+from api.resumes import resumes_bp, requeue_pending_resumes
 from api.positions import positions_bp
 from api.criteria import criteria_bp
 from api.candidates import candidates_bp
 
+# Every protected request re-checks that the token's user is still active
+jwt.token_verification_loader(verify_token_user)
+jwt.token_verification_failed_loader(inactive_token_response)
+
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(resumes_bp, url_prefix='/api/resumes')
@@ -66,42 +102,56 @@ app.register_blueprint(criteria_bp, url_prefix='/api/criteria')
 app.register_blueprint(candidates_bp, url_prefix='/api/candidates')
 
 # Initialize database
-init_database(config)
-create_default_admin()
-seed_database()
+init_database(config, create_schema=config.DB_BOOTSTRAP)
+if config.DB_BOOTSTRAP:
+    create_default_admin()
+    seed_database()
 
 logger.info("✅ Database initialized successfully")
 
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the schema, default admin and seed data"""
+    init_database(config)
+    create_default_admin()
+    seed_database()
+
+
+def init_forked_worker():
+    """
+    Per-process setup for a gunicorn worker forked from the preloaded app.
+    
+    Threads don't survive fork() and pooled connections must not be shared,
+    so the worker starts its own log listener, drops the inherited
+    connections and only then queues pending resumes on its own pool.
+    """
+    setup_logging(app)
+    dispose_engine_after_fork()
+    requeue_pending_resumes()
+
+
+# Pick up uploads whose processing never started before the last shutdown.
+# Under gunicorn's preload the master skips this; each worker does it after
+# fork (duplicates are harmless, only one worker can claim a resume).
+if not os.environ.get('TALENTRADAR_PRELOAD'):
+    requeue_pending_resumes()
+
+# Return each request thread's session/connection to the pool
+app.teardown_appcontext(remove_session)
+
 # ===================================
 # STATIC FILE SERVING ROUTES
 # ===================================
-
-@app.route('/')
-def index():
-    """Serve the main HTML page"""
-    try:
-        return send_from_directory('../frontend', 'index.html')
-    except Exception as e:
-        logger.error(f"Error serving index.html: {e}")
-        return jsonify({'error': 'Page not found'}), 404
-
-@app.route('/assets/<path:path>')
-def serve_assets(path):
-    """Serve static assets (CSS, JS, images)"""
-    try:
-        return send_from_directory('../frontend/assets', path)
-    except Exception as e:
-        logger.error(f"Error serving asset {path}: {e}")
-        return jsonify({'error': 'Asset not found'}), 404
+# (index.html and /assets are served by WhiteNoise, see above)
 
 @app.route('/uploads/<path:filename>')
 def serve_upload(filename):
     """Serve uploaded files for AI processing"""
     try:
-        upload_dir = os.path.join(app.root_path, '..', 'frontend', 'uploads')
-        return send_from_directory(upload_dir, filename)
+        return send_from_directory(UPLOADS_DIR, filename)
     except Exception as e:
-        logger.error(f"Error serving upload: {e}")
+        logger.error("Error serving upload: %s", e)
         return jsonify({'error': 'File not found'}), 404
     
 @app.route('/<path:path>')
@@ -111,11 +161,11 @@ def serve_static(path):
         if path.startswith('api/'):
             return jsonify({'error': 'API endpoint not found'}), 404
         
-        return send_from_directory('../frontend', path)
+        return send_from_directory(FRONTEND_DIR, path)
     except Exception as e:
-        logger.error(f"Error serving {path}: {e}")
+        logger.error("Error serving %s: %s", path, e)
         try:
-            return send_from_directory('../frontend', 'index.html')
+            return send_from_directory(FRONTEND_DIR, 'index.html')
         except:
             return jsonify({'error': 'Page not found'}), 404
 
@@ -126,41 +176,62 @@ def serve_static(path):
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    logger.warning(f"404 error: {error}")
+    logger.warning("404 error: %s", error)
     
     if '/api/' in str(error):
         return jsonify({'success': False, 'message': 'API endpoint not found'}), 404
     
     try:
-        return send_from_directory('../frontend', 'index.html')
+        return send_from_directory(FRONTEND_DIR, 'index.html')
     except:
         return jsonify({'success': False, 'message': 'Resource not found'}), 404
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    logger.error(f"Internal server error: {error}", exc_info=True)
+    logger.exception("Internal server error: %s", error)
     return jsonify({'success': False, 'message': 'Internal server error'}), 500
 
 @app.errorhandler(Exception)
 def handle_exception(error):
     """Handle all other exceptions"""
-    logger.error(f"Unhandled exception: {error}", exc_info=True)
+    logger.exception("Unhandled exception: %s", error)
     return jsonify({'success': False, 'message': 'An unexpected error occurred'}), 500
 
 # ===================================
 # HEALTH CHECK
 # ===================================
 
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
-        'success': True,
-        'status': 'healthy',
-        'version': '2.0.0',
-        'message': 'TalentRadar API is running'
-    })
+HEALTH_PATH = '/api/health'
+HEALTH_BODY = json_bytes({
+    'success': True,
+    'status': 'healthy',
+    'version': '2.0.0',
+    'message': 'TalentRadar API is running'
+})
+HEALTH_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(HEALTH_BODY))),
+    ('Cache-Control', 'no-store')
+]
+
+
+def health_middleware(wsgi_app):
+    """
+    Answer GET/HEAD /api/health with a prebuilt body before Flask dispatch.
+    
+    Load balancer and container probes hit this constantly; they need no
+    routing, JWT or CORS handling.
+    """
+    def middleware(environ, start_response):
+        if environ.get('PATH_INFO') == HEALTH_PATH and environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            start_response('200 OK', HEALTH_HEADERS)
+            return [HEALTH_BODY] if environ['REQUEST_METHOD'] == 'GET' else []
+        return wsgi_app(environ, start_response)
+    return middleware
+
+
+app.wsgi_app = health_middleware(app.wsgi_app)
 
 # ===================================
 # STARTUP MESSAGE
@@ -3,6 +3,7 @@ Configuration Management for TalentRadar v2
 FIXED: Correct AI model name for Liara API
 """
 import os
+from functools import cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -28,6 +29,16 @@ class Config:
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{DATA_DIR}/talentdatar.db')
     DATABASE_ECHO = os.getenv('DATABASE_ECHO', 'False') == 'True'
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # seconds
+    # DATABASE_URL points at pgbouncer (or similar): let it do the pooling
+    DB_EXTERNAL_POOL = os.getenv('DB_EXTERNAL_POOL', 'False') == 'True'
+    # Create schema, default admin and seed data when the app starts. init.sh
+    # (and `flask init-db`) do this before the server, so it can be skipped there.
+    DB_BOOTSTRAP = os.getenv('DB_BOOTSTRAP', 'True') == 'True'
+    # Raise on unplanned lazy loads in guarded list/detail queries (dev/test aid)
+    RAISE_ON_LAZY_LOAD = os.getenv('APP_RAISE_ON_LAZY_LOAD', 'False') == 'True'
     
     # AI Configuration
     # ✅ FIXED: Use correct model name from .env.template
@@ -38,24 +49,59 @@ class Config:
     
     # File Upload
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
-    ALLOWED_EXTENSIONS = set(os.getenv('ALLOWED_EXTENSIONS', 'pdf,docx,doc,jpg,jpeg,png').split(','))
+    ALLOWED_EXTENSIONS = frozenset(
+        ext.strip().lower().lstrip('.')
+        for ext in os.getenv('ALLOWED_EXTENSIONS', 'pdf,docx,doc,jpg,jpeg,png').split(',')
+        if ext.strip()
+    )
     
     # Server
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
     
+    # Static files
+    STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', 3600))  # seconds, for /assets
+    # Let a fronting nginx/Apache send file bodies (X-Sendfile); Flask only sets headers
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'False') == 'True'
+    
     # JWT
-    JWT_ACCESS_TOKEN_EXPIRES = 86400  # 24 hours
+    # Expiries in seconds; flask-jwt-extended takes ints as-is via from_object
+    JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 86400))  # 24 hours
+    JWT_REFRESH_TOKEN_EXPIRES = int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES', 2592000))  # 30 days
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
     
+    # Passwords
+    # bcrypt work factor; each +1 doubles hashing cost
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 10))
+    
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = LOG_FOLDER / 'app.log'
     
+    # Response compression (Flask-Compress)
+    COMPRESS_ALGORITHM = os.getenv('COMPRESS_ALGORITHM', 'br,gzip').split(',')
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    # Compressing a streamed response buffers the whole body first, which
+    # undoes the streaming of list_resumes; leave streamed bodies uncompressed
+    COMPRESS_STREAMS = os.getenv('COMPRESS_STREAMS', 'False') == 'True'
+    
+    # Caching
+    POSITIONS_CACHE_TTL = int(os.getenv('POSITIONS_CACHE_TTL', 60))  # seconds
+    # How long a process trusts its cached users.is_active; bounds how long a
+    # deactivated user's tokens keep working
+    ACTIVE_USER_CACHE_TTL = int(os.getenv('ACTIVE_USER_CACHE_TTL', 60))  # seconds
+    
     # Performance
     WORKERS = int(os.getenv('WORKERS', 4))
+    RESUME_WORKERS = int(os.getenv('RESUME_WORKERS', os.cpu_count() or 4))  # background resume processing workers
+    RESUME_WORKER_MODE = os.getenv('RESUME_WORKER_MODE', 'thread')  # thread or process
+    RESUME_DISPATCH = os.getenv('RESUME_DISPATCH', 'inline')  # inline (web process) or worker (worker.py)
+    RESUME_POLL_INTERVAL = float(os.getenv('RESUME_POLL_INTERVAL', 2))  # seconds between worker.py polls when idle
+    # A resume still 'processing' this long after its claim is assumed orphaned
+    # by a dead process and may be claimed again; keep it above the slowest run
+    RESUME_CLAIM_TIMEOUT = int(os.getenv('RESUME_CLAIM_TIMEOUT', 1800))  # seconds
     TIMEOUT = int(os.getenv('TIMEOUT', 300))
     
     @classmethod
@@ -82,6 +128,7 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
+    RAISE_ON_LAZY_LOAD = True
     DATABASE_URL = 'sqlite:///:memory:'
 
 
@@ -94,8 +141,9 @@ config = {
 }
 
 
+@cache
 def get_config(env=None):
-    """Get configuration based on environment"""
+    """Get configuration based on environment (resolved once per env argument)"""
     if env is None:
         env = os.getenv('FLASK_ENV', 'development')
     return config.get(env, config['default'])
\ No newline at end of file
@@ -1,4 +1,8 @@
-from .db import init_database, get_db, get_db_session, create_default_admin, seed_database, reset_database
+from .db import (
+    init_database, get_db, get_db_session, remove_session, record_exists,
+    lazy_load_guard,
+    create_default_admin, seed_database, reset_database
+)
 from .models import (
     Base, User, Position, Criterion, Candidate, Resume, 
     ResumeData, Score, ResumeScore, InterviewQuestion, 
@@ -9,6 +13,9 @@ __all__ = [
     'init_database',
     'get_db',
     'get_db_session',
+    'remove_session',
+    'record_exists',
+    'lazy_load_guard',
     'create_default_admin',
     'seed_database',
     'reset_database',
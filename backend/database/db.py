@@ -1,45 +1,82 @@
 """
 Database initialization and management
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, event, text, inspect, select, exists, update
+from sqlalchemy.orm import sessionmaker, scoped_session, raiseload
+from sqlalchemy.pool import StaticPool, NullPool
 from contextlib import contextmanager
 import logging
+import orjson
 
-from .models import Base
+from .models import Base, POSTGRES_SEARCH_DDL
 from backend.config import get_config
+from backend.utils.json_provider import json_bytes
 
 logger = logging.getLogger(__name__)
 
 # Global session factory
 SessionLocal = None
 engine = None
+_raise_on_lazy_load = False
 
 
-def init_database(config_class=None):
-    """Initialize database connection and create tables"""
-    global SessionLocal, engine
+def init_database(config_class=None, create_schema=True):
+    """
+    Initialize database connection and create tables.
+    
+    With create_schema=False only the engine and session factory are set
+    up, for processes started after the schema is known to be current.
+    """
+    global SessionLocal, engine, _raise_on_lazy_load
     
     if config_class is None:
         config_class = get_config()
     
+    _raise_on_lazy_load = getattr(config_class, 'RAISE_ON_LAZY_LOAD', False)
+    
     # Create engine
     connect_args = {}
+    engine_kwargs = {}
     if 'sqlite' in config_class.DATABASE_URL:
-        connect_args = {'check_same_thread': False}
+        # Wait up to 30s for a competing writer instead of failing "database is locked"
+        connect_args = {'check_same_thread': False, 'timeout': 30}
         
         # For in-memory databases, use StaticPool
         if ':memory:' in config_class.DATABASE_URL:
-            connect_args['poolclass'] = StaticPool
+            engine_kwargs['poolclass'] = StaticPool
+        else:
+            # One connection per concurrent request/resume thread; WAL lets
+            # their reads run in parallel
+            engine_kwargs.update(
+                pool_size=config_class.DB_POOL_SIZE,
+                max_overflow=config_class.DB_MAX_OVERFLOW
+            )
+    elif getattr(config_class, 'DB_EXTERNAL_POOL', False):
+        # pgbouncer owns the server connections; holding idle ones here
+        # would pin them and defeat transaction pooling
+        engine_kwargs['poolclass'] = NullPool
+    else:
+        # Keep a warm pool of server connections shared by request threads
+        engine_kwargs.update(
+            pool_size=config_class.DB_POOL_SIZE,
+            max_overflow=config_class.DB_MAX_OVERFLOW,
+            pool_recycle=config_class.DB_POOL_RECYCLE
+        )
     
     engine = create_engine(
         config_class.DATABASE_URL,
         echo=config_class.DATABASE_ECHO,
         connect_args=connect_args,
-        pool_pre_ping=True
+        pool_pre_ping=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        **engine_kwargs
     )
     
+    if engine.dialect.name == 'sqlite' and ':memory:' not in config_class.DATABASE_URL:
+        # Set once per pooled connection, not per session
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
+    
     # Create session factory
     session_factory = sessionmaker(
         autocommit=False,
@@ -48,14 +85,135 @@ def init_database(config_class=None):
     )
     SessionLocal = scoped_session(session_factory)
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    if create_schema:
+        _create_schema(engine)
     
     logger.info(f"✅ Database initialized: {config_class.DATABASE_URL}")
     
     return engine, SessionLocal
 
 
+def _create_schema(engine):
+    """Create missing tables, columns, indexes and Postgres search objects"""
+    Base.metadata.create_all(bind=engine)
+    added_columns = _ensure_columns(engine)
+    if ('resumes', 'candidate_name') in added_columns:
+        _backfill_resume_summary(engine)
+    _ensure_indexes(engine)
+    
+    if engine.dialect.name == 'postgresql':
+        _apply_postgres_ddl(engine)
+    elif engine.dialect.name == 'sqlite':
+        # Earlier versions created the summary index everywhere; here it
+        # only duplicates ix_resumes_pos_status_uploaded and slows inserts
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_resumes_pos_uploaded_summary"))
+
+
+def _apply_postgres_ddl(engine):
+    """
+    Apply POSTGRES_SEARCH_DDL, one statement per transaction.
+    
+    Managed databases often don't let the app's role create extensions.
+    These objects only speed queries up (search falls back to a plain
+    ILIKE scan), so a failure is logged rather than stopping startup.
+    """
+    for statement in POSTGRES_SEARCH_DDL:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(statement))
+        except Exception as e:
+            logger.warning(f"⚠️ Skipped optional Postgres DDL ({statement.split(' ON ')[0]}): {str(e)}")
+
+
+def _json_serializer(obj):
+    """Encode JSON columns with orjson, matching the API's JSON rules"""
+    return json_bytes(obj).decode('utf-8')
+
+
+# WAL lets the resume workers write while request threads read; with WAL,
+# synchronous=NORMAL only fsyncs at checkpoints and stays crash-safe; the
+# 256 MiB mmap serves hot pages without read() calls
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=268435456',
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to a new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _ensure_columns(engine):
+    """
+    Add nullable model columns missing from tables that predate them.
+    
+    Returns:
+        Set of (table, column) names that were added
+    """
+    inspector = inspect(engine)
+    added = set()
+    
+    for table in Base.metadata.sorted_tables:
+        existing = {col['name'] for col in inspector.get_columns(table.name)}
+        
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            added.add((table.name, column.name))
+            logger.info(f"Added missing column {column.name} to {table.name}")
+    
+    return added
+
+
+def _backfill_resume_summary(engine):
+    """Fill the denormalized list columns of resumes processed before they existed"""
+    from .models import Resume, Candidate, ResumeScore
+    
+    with engine.begin() as conn:
+        conn.execute(
+            update(Resume)
+            .where(Resume.processing_status == 'completed')
+            .values(
+                candidate_name=select(Candidate.full_name)
+                    .where(Candidate.id == Resume.candidate_id).scalar_subquery(),
+                score_percentage=select(ResumeScore.percentage)
+                    .where(ResumeScore.resume_id == Resume.id).scalar_subquery(),
+                score_status=select(ResumeScore.status)
+                    .where(ResumeScore.resume_id == Resume.id).scalar_subquery()
+            )
+        )
+    logger.info("Backfilled resume list summary columns")
+
+
+def _ensure_indexes(engine):
+    """Create model indexes missing from tables that predate them"""
+    inspector = inspect(engine)
+    
+    for table in Base.metadata.sorted_tables:
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                logger.info(f"Created missing index {index.name} on {table.name}")
+
+
+def dispose_engine_after_fork():
+    """Forget pooled connections inherited from the parent process without closing them"""
+    if engine is not None:
+        engine.dispose(close=False)
+
+
 def get_db():
     """Get database session (for dependency injection)"""
     db = SessionLocal()
@@ -65,6 +223,27 @@ def get_db():
         db.close()
 
 
+def remove_session(exception=None):
+    """Discard the current thread's scoped session (request teardown hook)"""
+    if SessionLocal is not None:
+        SessionLocal.remove()
+
+
+def lazy_load_guard():
+    """
+    Loader options to append after explicit eager loads.
+    
+    With RAISE_ON_LAZY_LOAD enabled, any relationship not eagerly loaded
+    raises instead of silently emitting a SELECT per row.
+    """
+    return (raiseload('*'),) if _raise_on_lazy_load else ()
+
+
+def record_exists(db, model, record_id):
+    """Check whether a row with the given primary key exists without loading it"""
+    return db.execute(select(exists().where(model.id == record_id))).scalar()
+
+
 @contextmanager
 def get_db_session():
     """Context manager for database sessions"""
@@ -3,16 +3,24 @@ Database Models for TalentRadar v2 - FIXED VERSION
 Fixed: ResumeData to handle JSON properly
 """
 from datetime import datetime
+from operator import attrgetter
+import bcrypt
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, DateTime, 
     ForeignKey, DECIMAL, JSON, UniqueConstraint, Index, Float
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+
+from backend.config import get_config
 
 Base = declarative_base()
 
+# Large AI payloads: stored as parsed jsonb on Postgres, JSON text elsewhere
+JSONDocument = JSON().with_variant(JSONB(), 'postgresql')
+
 
 class User(Base):
     """User model for authentication and authorization"""
@@ -34,12 +42,22 @@ class User(Base):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = bcrypt.hashpw(
+            password.encode('utf-8'), bcrypt.gensalt(rounds=get_config().BCRYPT_ROUNDS)
+        ).decode('utf-8')
     
     def check_password(self, password):
-        """Verify password"""
+        """Verify password (bcrypt, or legacy werkzeug hashes)"""
+        if self.password_hash.startswith('$2'):
+            return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
         return check_password_hash(self.password_hash, password)
     
+    def needs_rehash(self):
+        """Whether the stored hash should be upgraded to the current bcrypt settings"""
+        if not self.password_hash.startswith('$2'):
+            return True
+        return int(self.password_hash.split('$')[2]) != get_config().BCRYPT_ROUNDS
+    
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -88,11 +106,20 @@ class Position(Base):
         return data
 
 
+# Serialized fields, read in one C-level attrgetter call per row
+_CRITERION_DICT_KEYS = (
+    'id', 'position_id', 'criterion_key', 'criterion_name', 'category',
+    'data_type', 'weight', 'config_json', 'is_required', 'display_order'
+)
+_criterion_values = attrgetter(*_CRITERION_DICT_KEYS)
+
+
 class Criterion(Base):
     """Evaluation criteria model with flexible configuration"""
     __tablename__ = 'criteria'
     __table_args__ = (
         UniqueConstraint('position_id', 'criterion_key', name='uq_position_criterion'),
+        Index('ix_criteria_pos_order', 'position_id', 'display_order'),
     )
     
     id = Column(Integer, primary_key=True)
@@ -113,18 +140,14 @@ class Criterion(Base):
     
     def to_dict(self):
         """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'position_id': self.position_id,
-            'criterion_key': self.criterion_key,
-            'criterion_name': self.criterion_name,
-            'category': self.category,
-            'data_type': self.data_type,
-            'weight': self.weight,
-            'config_json': self.config_json,
-            'is_required': self.is_required,
-            'display_order': self.display_order
-        }
+        return dict(zip(_CRITERION_DICT_KEYS, _criterion_values(self)))
+
+
+_CANDIDATE_DICT_KEYS = (
+    'id', 'phone', 'full_name', 'email', 'first_seen', 'last_updated',
+    'total_submissions', 'notes_summary'
+)
+_candidate_values = attrgetter(*_CANDIDATE_DICT_KEYS)
 
 
 class Candidate(Base):
@@ -146,16 +169,11 @@ class Candidate(Base):
     
     def to_dict(self, include_resumes=False):
         """Convert to dictionary"""
-        data = {
-            'id': self.id,
-            'phone': self.phone,
-            'full_name': self.full_name,
-            'email': self.email,
-            'first_seen': self.first_seen.isoformat() if self.first_seen else None,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None,
-            'total_submissions': self.total_submissions,
-            'notes_summary': self.notes_summary
-        }
+        data = dict(zip(_CANDIDATE_DICT_KEYS, _candidate_values(self)))
+        
+        for key in ('first_seen', 'last_updated'):
+            if data[key]:
+                data[key] = data[key].isoformat()
         
         if include_resumes:
             data['resumes'] = [r.to_dict() for r in self.resumes]
@@ -174,8 +192,15 @@ class Resume(Base):
     file_path = Column(String(500), nullable=False)
     file_type = Column(String(20))
     file_size = Column(Integer)
+    content_hash = Column(String(64))  # SHA-256 of the uploaded file
     processing_status = Column(String(50), default='pending', index=True)  # pending, processing, completed, failed
-    ai_analysis_json = Column(JSON)  # Full AI response
+    claimed_at = Column(DateTime)  # when a worker moved it to 'processing'
+    ai_analysis_json = Column(JSONDocument)  # Full AI response
+    # Copies of the candidate name and aggregate score, set when processing
+    # completes, so the summary list reads them without joins
+    candidate_name = Column(String(200))
+    score_percentage = Column(Float)
+    score_status = Column(String(20))
     uploaded_by = Column(Integer, ForeignKey('users.id'))
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     
@@ -188,6 +213,14 @@ class Resume(Base):
     aggregate_score = relationship('ResumeScore', back_populates='resume', uselist=False, cascade='all, delete-orphan')
     interview_questions = relationship('InterviewQuestion', back_populates='resume', cascade='all, delete-orphan')
     
+    # list_resumes orders by upload time, optionally filtered by position/status
+    __table_args__ = (
+        Index('ix_resumes_uploaded', uploaded_at.desc()),
+        Index('ix_resumes_pos_status_uploaded', position_id, processing_status, uploaded_at.desc()),
+        # Re-uploads of the same file for the same position reuse its extraction
+        Index('ix_resumes_content_hash', content_hash, position_id),
+    )
+    
     def to_dict(self, include_details=False):
         """Convert to dictionary"""
         data = {
@@ -215,7 +248,7 @@ class ResumeData(Base):
     
     id = Column(Integer, primary_key=True)
     resume_id = Column(Integer, ForeignKey('resumes.id', ondelete='CASCADE'), nullable=False, unique=True)
-    extracted_json = Column(JSON, nullable=False)  # Store all extracted data as JSON
+    extracted_json = Column(JSONDocument, nullable=False)  # Store all extracted data as JSON
     extracted_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -244,6 +277,10 @@ class Score(Base):
     reasoning = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('ix_scores_resume', 'resume_id'),
+    )
+    
     # Relationships
     resume = relationship('Resume', back_populates='scores')
     criterion = relationship('Criterion', back_populates='scores')
@@ -332,6 +369,11 @@ class CandidateNote(Base):
     candidate = relationship('Candidate', back_populates='notes')
     author = relationship('User', back_populates='notes')
     
+    # Serves "notes for a candidate, newest first" straight from the index
+    __table_args__ = (
+        Index('ix_notes_cand_created', candidate_id, created_at.desc()),
+    )
+    
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -394,4 +436,18 @@ class AuditLog(Base):
     __table_args__ = (
         Index('idx_audit_user_action', 'user_id', 'action'),
         Index('idx_audit_table_record', 'table_name', 'record_id'),
-    )
\ No newline at end of file
+    )
+
+
+# PostgreSQL-only DDL backing candidate search: a trigram GIN index over the
+# same expression search_candidates filters on, plus a covering index for the
+# resume summary list. Without INCLUDE (SQLite) the latter would only repeat
+# ix_resumes_pos_status_uploaded, so it lives here. Applied idempotently at
+# startup; a statement the database role isn't allowed to run is skipped.
+POSTGRES_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_candidates_search_trgm ON candidates USING gin "
+    "((coalesce(full_name, '') || ' ' || coalesce(phone, '') || ' ' || coalesce(email, '')) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_resumes_pos_uploaded_summary ON resumes "
+    "(position_id, uploaded_at DESC) INCLUDE (candidate_name, score_percentage, score_status)",
+)
@@ -212,9 +212,7 @@ class AIService:
             raise ValueError(f"Failed to connect to API: {str(e)}")
             
         except Exception as e:
-            logger.error(f"❌ Error: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Error: %s", e)
             raise
     
     def generate_text(self, prompt: str, max_tokens: int = 1000) -> str:
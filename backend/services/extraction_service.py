@@ -8,8 +8,13 @@ import re
 from typing import Dict, Any
 from pathlib import Path
 
+from backend.config import get_config
+
 logger = logging.getLogger(__name__)
 
+# Below this many characters a text layer is treated as missing (scanned PDF)
+MIN_TEXT_LAYER_CHARS = 200
+
 
 class ExtractionService:
     def __init__(self):
@@ -88,30 +93,20 @@ Return ONLY valid JSON, ALL TEXT IN ENGLISH."""
         Extract data from resume
         """
         try:
-            from database.db import get_db_session
-            from database.models import Position, Criterion
             from services.ai_service import ai_service
+            from services.position_cache import get_position_with_criteria
             
             logger.info(f"📄 Starting extraction for: {file_path}")
             
-            position_title = None
-            criteria_list = []
+            position, criteria = get_position_with_criteria(position_id)
+            if not position:
+                raise ValueError(f"Position {position_id} not found")
             
-            with get_db_session() as db:
-                position = db.query(Position).filter_by(id=position_id).first()
-                
-                if not position:
-                    raise ValueError(f"Position {position_id} not found")
-                
-                position_title = str(position.title)
-                
-                criteria = db.query(Criterion).filter_by(position_id=position_id).order_by(Criterion.display_order).all()
-                
-                for criterion in criteria:
-                    criteria_list.append({
-                        'name': str(criterion.criterion_name),
-                        'key': str(criterion.criterion_key)
-                    })
+            position_title = str(position.title)
+            criteria_list = [
+                {'name': str(criterion.criterion_name), 'key': str(criterion.criterion_key)}
+                for criterion in criteria
+            ]
             
             criteria_text = "\n".join([f"- {c['name']} ({c['key']})" for c in criteria_list]) if criteria_list else "No specific criteria"
             
@@ -129,7 +124,17 @@ IMPORTANT: Return ONLY the JSON object, no markdown, no explanations."""
             logger.info(f"📏 File exists: {Path(file_path).exists()}")
             logger.info(f"📏 File size: {Path(file_path).stat().st_size if Path(file_path).exists() else 'N/A'}")
             
-            ai_response = ai_service.analyze_resume(file_path, final_prompt)
+            text_layer = self._read_text_layer(file_path)
+            if len(text_layer.strip()) >= MIN_TEXT_LAYER_CHARS:
+                # Fast tier: send the embedded text instead of the encoded file
+                logger.info(f"⚡ Extraction tier: text layer ({len(text_layer)} chars)")
+                ai_response = ai_service.generate_text(
+                    f"RESUME TEXT:\n{text_layer}\n\n{final_prompt}",
+                    max_tokens=get_config().AI_MAX_TOKENS
+                )
+            else:
+                logger.info("📎 Extraction tier: full file (no usable text layer)")
+                ai_response = ai_service.analyze_resume(file_path, final_prompt)
             
             if not ai_response:
                 raise ValueError("AI service returned empty response")
@@ -148,11 +153,28 @@ IMPORTANT: Return ONLY the JSON object, no markdown, no explanations."""
             return extracted_data
                 
         except Exception as e:
-            logger.error(f"❌ Extraction error: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Extraction error: %s", e)
             raise
     
+    def _read_text_layer(self, file_path: str) -> str:
+        """Return the text embedded in a PDF/DOCX, or '' if there is none or it can't be read"""
+        ext = Path(file_path).suffix.lower()
+        
+        try:
+            if ext == '.pdf':
+                from PyPDF2 import PdfReader
+                reader = PdfReader(file_path)
+                return "\n".join(page.extract_text() or '' for page in reader.pages)
+            
+            if ext == '.docx':
+                import docx
+                document = docx.Document(file_path)
+                return "\n".join(paragraph.text for paragraph in document.paragraphs)
+        except Exception as e:
+            logger.warning(f"Could not read text layer from {file_path}: {str(e)}")
+        
+        return ''
+    
     def _parse_ai_response(self, response: str) -> Dict[str, Any]:
         """Parse AI response to JSON"""
         try:
@@ -0,0 +1,67 @@
+"""
+Position + Criteria Cache for Resume Processing
+
+Extraction and scoring both need a position and its criteria for every
+resume, and those rows rarely change. They are loaded once per position
+and kept as detached instances for POSITIONS_CACHE_TTL seconds.
+"""
+import time
+import logging
+from typing import Any, List, Optional, Tuple
+
+from backend.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# position_id -> (expires_at, position, criteria). The API invalidates on
+# change; the TTL bounds staleness across processes that don't see that.
+_CACHE_TTL = get_config().POSITIONS_CACHE_TTL
+_cache = {}
+
+
+def get_position_with_criteria(position_id: int) -> Tuple[Optional[Any], List[Any]]:
+    """
+    Get a position and its criteria ordered by display_order
+
+    Returns:
+        (position, criteria) as detached instances, or (None, []) if the
+        position doesn't exist. Only column attributes may be read from
+        them; relationships are not loaded.
+    """
+    entry = _cache.get(position_id)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1], entry[2]
+
+    from database import db as database
+    from database.models import Position, Criterion
+
+    # A private session rather than the scoped one: callers may be inside
+    # their own get_db_session() block on this thread
+    db = database.SessionLocal.session_factory()
+    try:
+        position = db.get(Position, position_id)
+        if not position:
+            return None, []
+
+        criteria = db.query(Criterion)\
+            .filter_by(position_id=position_id)\
+            .order_by(Criterion.display_order)\
+            .all()
+
+        # Detach only what we loaded, so attributes survive the close
+        db.expunge(position)
+        for criterion in criteria:
+            db.expunge(criterion)
+    finally:
+        db.close()
+
+    _cache[position_id] = (time.monotonic() + _CACHE_TTL, position, criteria)
+    return position, criteria
+
+
+def invalidate_position_cache(position_id: Optional[int] = None) -> None:
+    """Drop one cached position (or all of them) after a committed change"""
+    if position_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(position_id, None)
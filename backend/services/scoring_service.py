@@ -33,16 +33,17 @@ class ScoringEngine:
         Returns:
             Dictionary with scoring results
         """
-        from database.models import Position, Score, ResumeScore, Criterion
+        from database.models import Score, ResumeScore
+        from sqlalchemy import insert, delete
         from services.ai_service import ai_service
+        from services.position_cache import get_position_with_criteria
         
         try:
-            # Get position and criteria
-            position = db.query(Position).filter_by(id=position_id).first()
+            # Get position and criteria (cached, detached instances)
+            position, criteria = get_position_with_criteria(position_id)
             if not position:
                 raise ValueError(f"Position {position_id} not found")
             
-            criteria = position.criteria
             if not criteria:
                 logger.warning(f"No criteria defined for position {position_id}")
                 return {'message': 'No criteria defined for scoring'}
@@ -57,20 +58,25 @@ class ScoringEngine:
             # Parse LLM response
             scoring_results = self._parse_llm_scoring_response(ai_response, criteria, db)
             
-            # Save individual scores
-            individual_scores = []
-            for result in scoring_results['individual_scores']:
-                score = Score(
-                    resume_id=resume_id,
-                    criterion_id=result['criterion_id'],
-                    awarded_points=result['awarded_points'],
-                    max_points=result['max_points'],
-                    score_multiplier=result['score_multiplier'],
-                    extracted_value=result.get('extracted_value'),
-                    reasoning=result.get('reasoning')
-                )
-                db.add(score)
-                individual_scores.append(result)
+            # Replace any scores from an earlier run of this resume
+            db.execute(delete(Score).where(Score.resume_id == resume_id))
+            db.execute(delete(ResumeScore).where(ResumeScore.resume_id == resume_id))
+            
+            # Save individual scores in one executemany INSERT
+            individual_scores = scoring_results['individual_scores']
+            if individual_scores:
+                db.execute(insert(Score), [
+                    {
+                        'resume_id': resume_id,
+                        'criterion_id': result['criterion_id'],
+                        'awarded_points': result['awarded_points'],
+                        'max_points': result['max_points'],
+                        'score_multiplier': result['score_multiplier'],
+                        'extracted_value': result.get('extracted_value'),
+                        'reasoning': result.get('reasoning')
+                    }
+                    for result in individual_scores
+                ])
             
             # Calculate aggregate score
             aggregate_result = self.calculate_aggregate_score(
@@ -89,7 +95,8 @@ class ScoringEngine:
             )
             db.add(resume_score)
             
-            db.commit()
+            # The caller owns the transaction and commits it with its other writes
+            db.flush()
             
             logger.info(f"Resume {resume_id} scored: {aggregate_result['percentage']:.2f}% - {aggregate_result['status']}")
             
@@ -99,9 +106,7 @@ class ScoringEngine:
             }
             
         except Exception as e:
-            logger.error(f"Error scoring resume {resume_id}: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("Error scoring resume %s: %s", resume_id, e)
             raise
     
     def _build_scoring_prompt(self, position: Any, criteria: List[Any], extracted_data: Dict[str, Any]) -> str:
@@ -219,13 +224,16 @@ MUST INCLUDE ALL CRITERIA IN OUTPUT. NOW SCORE THIS CANDIDATE:"""
             # Build criterion lookup (case-insensitive)
             criterion_lookup = {c.criterion_key.lower(): c for c in criteria}
             
-            # Process individual scores
+            # Process individual scores (hot names bound once for the loop)
             individual_scores = []
+            append_score = individual_scores.append
+            find_criterion = criterion_lookup.get
             for score_data in data.get('individual_scores', []):
-                criterion_key = score_data.get('criterion_key', '').lower()
+                get = score_data.get
+                criterion_key = get('criterion_key', '').lower()
                 
                 # Find matching criterion
-                criterion = criterion_lookup.get(criterion_key)
+                criterion = find_criterion(criterion_key)
                 
                 if not criterion:
                     logger.warning(f"Criterion not found: {criterion_key}, trying fuzzy match")
@@ -240,19 +248,24 @@ MUST INCLUDE ALL CRITERIA IN OUTPUT. NOW SCORE THIS CANDIDATE:"""
                     logger.warning(f"Could not match criterion: {criterion_key}, skipping")
                     continue
                 
-                awarded = float(score_data.get('awarded_points', 0))
+                awarded = float(get('awarded_points', 0))
                 max_pts = float(criterion.weight)
                 multiplier = min(awarded / max_pts if max_pts > 0 else 0, 1.0)
                 
-                individual_scores.append({
+                # scores.extracted_value is Text; the LLM may return numbers/bools
+                extracted_value = get('extracted_value')
+                if extracted_value is not None:
+                    extracted_value = str(extracted_value)
+                
+                append_score({
                     'criterion_id': criterion.id,
                     'criterion_key': criterion.criterion_key,
-                    'criterion_name': score_data.get('criterion_name', criterion.criterion_name),
+                    'criterion_name': get('criterion_name', criterion.criterion_name),
                     'awarded_points': awarded,
                     'max_points': max_pts,
                     'score_multiplier': multiplier,
-                    'extracted_value': score_data.get('extracted_value'),
-                    'reasoning': score_data.get('reasoning', '')
+                    'extracted_value': extracted_value,
+                    'reasoning': get('reasoning', '')
                 })
                 
                 logger.info(f"Scored {criterion.criterion_name}: {awarded:.1f}/{max_pts}")
@@ -286,9 +299,7 @@ MUST INCLUDE ALL CRITERIA IN OUTPUT. NOW SCORE THIS CANDIDATE:"""
             logger.error(f"Response: {response[:500]}")
             raise ValueError(f"Invalid JSON from LLM: {str(e)}")
         except Exception as e:
-            logger.error(f"Error parsing scoring response: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("Error parsing scoring response: %s", e)
             raise
     
     def calculate_aggregate_score(
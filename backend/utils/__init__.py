@@ -5,7 +5,8 @@ from .validators import (
 )
 from .helpers import (
     convert_persian_to_english_numbers, normalize_arabic_to_persian,
-    format_phone_number, generate_unique_filename, calculate_file_hash
+    format_phone_number, generate_unique_filename, calculate_file_hash,
+    encode_cursor, decode_cursor
 )
 
 __all__ = [
@@ -21,5 +22,7 @@ __all__ = [
     'normalize_arabic_to_persian',
     'format_phone_number',
     'generate_unique_filename',
-    'calculate_file_hash'
+    'calculate_file_hash',
+    'encode_cursor',
+    'decode_cursor'
 ]
\ No newline at end of file
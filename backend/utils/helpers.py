@@ -2,9 +2,11 @@
 Helper Utilities
 """
 import re
+import json
+import base64
 import hashlib
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -185,4 +187,38 @@ def clean_whitespace(text: str) -> str:
     
     text = re.sub(r'\s+', ' ', text)
     
-    return text.strip()
\ No newline at end of file
+    return text.strip()
+
+def encode_cursor(timestamp: datetime, record_id: int) -> str:
+    """
+    Encode a keyset pagination position as an opaque cursor
+    
+    Args:
+        timestamp: Sort timestamp of the last returned row
+        record_id: Primary key of the last returned row
+        
+    Returns:
+        URL-safe base64 cursor string
+    """
+    payload = json.dumps([timestamp.isoformat() if timestamp else None, record_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Opaque cursor string
+        
+    Returns:
+        Tuple of (timestamp, record_id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        timestamp, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(timestamp), int(record_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
@@ -0,0 +1,45 @@
+"""
+orjson-backed JSON provider for Flask
+"""
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+def _default(obj):
+    """Serialize types orjson doesn't handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_bytes(obj):
+    """Encode obj to JSON bytes with the same rules as the app's provider"""
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    JSON provider using orjson for encoding and decoding.
+
+    Installed as ``app.json`` so ``jsonify`` and ``request.json`` go through
+    orjson without touching individual endpoints.
+    """
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return json_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            json_bytes(obj),
+            mimetype=self.mimetype
+        )
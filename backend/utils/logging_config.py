@@ -4,11 +4,31 @@ Handles Unicode characters properly
 """
 import logging
 import logging.handlers
+import atexit
+import queue
 import os
 from datetime import datetime
 
+# Background listener that owns the real (blocking) handlers
+_listener = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener's handlers.
+    
+    The stock prepare() renders the message and traceback on the logging
+    thread so records can be pickled; the queue here is in-process, so the
+    record is passed through untouched.
+    """
+    
+    def prepare(self, record):
+        return record
+
+
 def setup_logging(app=None):
     """Setup logging configuration with proper Unicode handling"""
+    global _listener
     
     # Create logs directory if it doesn't exist
     log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
@@ -25,9 +45,12 @@ def setup_logging(app=None):
         datefmt='%H:%M:%S'
     )
     
+    # LOG_LEVEL=WARNING skips building every per-resume INFO record
+    log_level = getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+    
     # Root logger configuration
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
+    root_logger.setLevel(log_level)
     
     # Remove existing handlers
     root_logger.handlers = []
@@ -42,11 +65,10 @@ def setup_logging(app=None):
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(file_handler)
     
     # Console handler with UTF-8 support
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(log_level)
     console_handler.setFormatter(simple_formatter)
     
     # Try to set UTF-8 encoding for console (Windows specific)
@@ -68,16 +90,31 @@ def setup_logging(app=None):
     except Exception:
         pass  # Ignore if unable to set encoding
     
-    root_logger.addHandler(console_handler)
+    # Request threads only enqueue records; a listener thread does the
+    # formatting and file/console I/O (see _DeferredQueueHandler)
+    if _listener is not None:
+        # stop() isn't idempotent, so don't leave it to atexit as well
+        atexit.unregister(_listener.stop)
+        _listener.stop()
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+    
+    root_logger.addHandler(queue_handler)
     
     # Specific loggers configuration
     loggers_config = {
         'werkzeug': logging.WARNING,
         'sqlalchemy.engine': logging.WARNING,  # Set to INFO to see SQL queries
-        'api.resumes': logging.DEBUG,
-        'services.extraction_service': logging.DEBUG,
-        'services.ai_service': logging.DEBUG,
-        'services.scoring_service': logging.DEBUG,
+        'api.resumes': log_level,
+        'services.extraction_service': log_level,
+        'services.ai_service': log_level,
+        'services.scoring_service': log_level,
         'database.db': logging.INFO,
     }
     
@@ -88,9 +125,8 @@ def setup_logging(app=None):
     # Application logger if Flask app is provided
     if app:
         app.logger.handlers = []
-        app.logger.addHandler(file_handler)
-        app.logger.addHandler(console_handler)
-        app.logger.setLevel(logging.INFO)
+        app.logger.addHandler(queue_handler)
+        app.logger.setLevel(log_level)
     
     # Log startup message
     logging.info("=" * 60)
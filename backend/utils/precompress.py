@@ -0,0 +1,62 @@
+"""
+Static Asset Precompression
+
+Writes .gz (and .br, when brotli is available) siblings next to each text
+asset so /assets can send them as-is instead of compressing per request.
+
+Usage: python backend/utils/precompress.py frontend/assets
+"""
+import gzip
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli ships with Flask-Compress
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.html', '.json', '.svg', '.txt')
+
+
+def _write_if_smaller(path, data, compressed):
+    """Keep a compressed sibling only when it actually saves bytes"""
+    if len(compressed) >= len(data):
+        if os.path.exists(path):
+            os.unlink(path)
+        return False
+
+    with open(path, 'wb') as fh:
+        fh.write(compressed)
+    return True
+
+
+def precompress_assets(directory):
+    """
+    Compress every text asset under directory.
+
+    Returns:
+        Number of compressed files written
+    """
+    written = 0
+
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+
+            source = os.path.join(root, name)
+            with open(source, 'rb') as fh:
+                data = fh.read()
+
+            written += _write_if_smaller(source + '.gz', data, gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                written += _write_if_smaller(source + '.br', data, brotli.compress(data, quality=11))
+
+    return written
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(__file__), '..', '..', 'frontend', 'assets'
+    )
+    print(f"🗜️  Precompressed {precompress_assets(target)} asset file(s) in {target}")
@@ -154,6 +154,9 @@ const api = {
         let url = `${API_URL}/resumes`;
         const params = new URLSearchParams();
         
+        // Only name, position, status and score are shown in lists
+        params.append('view', 'summary');
+        
         if (filters.position_id) {
             params.append('position_id', filters.position_id);
         }
@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for TalentRadar
+
+Threaded workers suit the app: requests mostly wait on the database and
+on file I/O. The app is imported once in the master and the workers are
+forked from it, so they share its loaded modules copy-on-write instead of
+each importing (and initializing the database) again.
+"""
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+workers = int(os.getenv('WORKERS', os.cpu_count() or 4))
+worker_class = 'gthread'
+threads = int(os.getenv('THREADS', 4))
+
+preload_app = True
+timeout = int(os.getenv('TIMEOUT', 300))  # uploads are written synchronously
+keepalive = 5
+graceful_timeout = 30
+
+accesslog = '-'
+
+# Tells app.py it is being preloaded: per-process startup runs in post_fork
+os.environ['TALENTRADAR_PRELOAD'] = '1'
+
+
+def post_fork(server, worker):
+    from app import init_forked_worker
+    init_forked_worker()
@@ -54,10 +54,12 @@ print('========================================')
 
 echo ""
 echo "========================================="
-echo "🚀 Starting Flask Application..."
+echo "🚀 Starting TalentRadar (gunicorn)..."
 echo "========================================="
 echo "📍 URL: http://${HOST}:${PORT}"
 echo "========================================="
 
-# Start Flask app
-exec python3 run.py
\ No newline at end of file
+# Start the app under gunicorn (run.py is the development server).
+# The database was bootstrapped above, so the app skips doing it again.
+export DB_BOOTSTRAP=False
+exec gunicorn -c gunicorn.conf.py wsgi:app
\ No newline at end of file
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+TalentRadar Resume Worker
+
+Processes uploaded resumes outside the web process. Run the web app with
+RESUME_DISPATCH=worker so uploads are only recorded as 'pending', then start
+one or more of these:
+
+    RESUME_DISPATCH=worker python3 worker.py
+
+Workers poll for pending resumes and claim each one with the same
+pending -> processing update the in-process pool uses, so several workers
+can run side by side. SIGTERM/SIGINT stop polling and let in-flight
+resumes finish before exiting.
+"""
+import sys
+import signal
+import logging
+import threading
+from pathlib import Path
+
+# Add backend to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from config import get_config
+from database.db import init_database
+from utils.logging_config import setup_logging
+from api.resumes import make_resume_executor, pending_resumes, process_resume_async
+
+logger = logging.getLogger('worker')
+
+
+def run_worker(config):
+    """Poll for pending resumes until stopped, keeping every worker slot busy"""
+    executor = make_resume_executor(config)
+    stop = threading.Event()
+    in_flight = set()
+
+    def request_stop(signum, frame):
+        logger.info("🛑 Stop requested, finishing in-flight resumes...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    logger.info(f"🚀 Resume worker started ({config.RESUME_WORKERS} {config.RESUME_WORKER_MODE} worker(s))")
+
+    while not stop.is_set():
+        free_slots = config.RESUME_WORKERS - len(in_flight)
+        submitted = 0
+
+        if free_slots > 0:
+            # In-flight resumes stay 'pending' until claimed, so fetch enough
+            # rows to fill the free slots even if some are already ours
+            for resume_id, position_id in pending_resumes(limit=free_slots + len(in_flight)):
+                if submitted == free_slots:
+                    break
+                if resume_id in in_flight:
+                    continue
+
+                in_flight.add(resume_id)
+                future = executor.submit(process_resume_async, resume_id, position_id)
+                future.add_done_callback(lambda _f, rid=resume_id: in_flight.discard(rid))
+                submitted += 1
+
+        if not submitted:
+            stop.wait(config.RESUME_POLL_INTERVAL)
+
+    executor.shutdown(wait=True)
+    logger.info("✅ Resume worker stopped")
+
+
+if __name__ == '__main__':
+    config = get_config()
+
+    setup_logging()
+    init_database(config)
+
+    run_worker(config)
@@ -0,0 +1,14 @@
+"""
+TalentRadar WSGI Entry Point
+
+Production servers load the app from here:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import sys
+from pathlib import Path
+
+# Add backend to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from app import app  # noqa: E402